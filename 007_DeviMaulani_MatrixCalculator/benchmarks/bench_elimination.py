@@ -0,0 +1,81 @@
+"""Row-by-row vs. rank-1 (outer product) elimination in logic.spl_ops.
+
+Run from the project directory:
+
+    python benchmarks/bench_elimination.py
+    python benchmarks/bench_elimination.py --sizes 10 100 1000 --loop-max 500
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import spl_ops as so  # noqa: E402
+
+
+def loop_elimination(A: np.ndarray, b: np.ndarray):
+    # the previous kernel: one Python-level row update per eliminated entry
+    A = A.astype(float).copy()
+    b = b.astype(float).copy().reshape(-1, 1)
+    m, n = A.shape
+    row = 0
+    for col in range(n):
+        if row >= m:
+            break
+        pivot = row + np.argmax(np.abs(A[row:, col]))
+        if abs(A[pivot, col]) < 1e-12:
+            continue
+        if pivot != row:
+            A[[row, pivot]] = A[[pivot, row]]
+            b[[row, pivot]] = b[[pivot, row]]
+        piv_val = A[row, col]
+        A[row] = A[row] / piv_val
+        b[row] = b[row] / piv_val
+        for r in range(row + 1, m):
+            factor = A[r, col]
+            if abs(factor) < 1e-12:
+                continue
+            A[r] = A[r] - factor * A[row]
+            b[r] = b[r] - factor * b[row]
+        row += 1
+    return A, b
+
+
+def best_of(fn, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[10, 20, 50, 100, 200, 500, 1000, 2000])
+    ap.add_argument("--loop-max", type=int, default=1000, help="skip the row loop above this n")
+    ap.add_argument("--repeat", type=int, default=3)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'n':>6} {'loop [s]':>10} {'rank-1 [s]':>11} {'speedup':>8} {'residual':>10}")
+    for n in args.sizes:
+        A = rng.standard_normal((n, n)) + n * np.eye(n)
+        b = rng.standard_normal(n)
+        repeat = args.repeat if n <= 500 else 1
+        t_vec = best_of(lambda: so.gaussian_elimination(A, b, steps="none"), repeat)
+        x, _ = so.gaussian_elimination(A, b, steps="none")
+        res = np.linalg.norm(A @ x - b) / np.linalg.norm(b)
+        if n <= args.loop_max:
+            t_loop = best_of(lambda: loop_elimination(A, b), repeat)
+            print(f"{n:>6} {t_loop:>10.4f} {t_vec:>11.4f} {t_loop / t_vec:>7.1f}x {res:>10.2e}")
+        else:
+            print(f"{n:>6} {'-':>10} {t_vec:>11.4f} {'-':>8} {res:>10.2e}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""Exact (Bareiss) vs. naive Fraction elimination vs. float64 LU in logic.
+
+Run from the project directory:
+
+    python benchmarks/bench_exact.py
+    python benchmarks/bench_exact.py --sizes 5 10 20 --naive-max 20
+"""
+import argparse
+import os
+import sys
+import time
+from fractions import Fraction
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from logic import exact_ops as eo  # noqa: E402
+from logic import spl_ops as so  # noqa: E402
+
+
+def naive_fraction_solve(A: np.ndarray, b: np.ndarray):
+    # straight Gauss-Jordan on Fractions: numerators and denominators grow with every step
+    n = A.shape[0]
+    M = [[Fraction(int(v)) for v in row] + [Fraction(int(bi))] for row, bi in zip(A, b)]
+    for c in range(n):
+        p = next(i for i in range(c, n) if M[i][c] != 0)
+        M[c], M[p] = M[p], M[c]
+        piv = M[c][c]
+        M[c] = [v / piv for v in M[c]]
+        for i in range(n):
+            if i != c and M[i][c] != 0:
+                f = M[i][c]
+                M[i] = [vi - f * vc for vi, vc in zip(M[i], M[c])]
+    return [row[n] for row in M]
+
+
+def timed(fn):
+    t0 = time.perf_counter()
+    out = fn()
+    return time.perf_counter() - t0, out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--sizes", type=int, nargs="+", default=[5, 10, 20, 30, 40, 50])
+    ap.add_argument("--naive-max", type=int, default=30, help="skip the naive Fraction solve above this n")
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'n':>4} {'float LU [s]':>13} {'Bareiss [s]':>12} {'naive Fraction [s]':>19} {'max digits':>11}")
+    for n in args.sizes:
+        A = rng.integers(-9, 10, (n, n)).astype(float)
+        b = rng.integers(-9, 10, n).astype(float)
+        t_float, _ = timed(lambda: so.LUFactorization(A, steps="none").solve(b))
+        t_exact, (x, _) = timed(lambda: eo.solve_exact(A, b))
+        digits = max(len(str(v.denominator)) for v in x)
+        if n <= args.naive_max:
+            t_naive, xn = timed(lambda: naive_fraction_solve(A, b))
+            assert xn == x
+            naive = f"{t_naive:>19.4f}"
+        else:
+            naive = f"{'-':>19}"
+        print(f"{n:>4} {t_float:>13.5f} {t_exact:>12.4f} {naive} {digits:>11}")
+
+
+if __name__ == "__main__":
+    main()
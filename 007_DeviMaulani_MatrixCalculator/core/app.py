@@ -1,6 +1,7 @@
 import sys
+import time
 from PyQt5.QtWidgets import QApplication, QMainWindow, QStackedWidget, QWidget
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer, pyqtSignal
 
 from views.welcome_view import WelcomePage
 from views.matrix_view import MatrixCalculatorPage
@@ -9,9 +10,16 @@ from views.spl_view import SPLCalculatorPage
 from views.quiz_view import QuizPage
 from views.quiz_setup_view import QuizSetupPage
 from core.theme import app_stylesheet
+from core.history import HISTORY
 
 
 class MainWindow(QMainWindow):
+    # emitted from the history loader/sync threads, delivered on the GUI thread
+    history_ready = pyqtSignal()
+    history_synced = pyqtSignal()
+    # how often entries saved by other running instances are picked up
+    SYNC_INTERVAL_MS = 5000
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Kalkulator Aljabar Linear")
@@ -36,8 +44,22 @@ class MainWindow(QMainWindow):
         self.stack.addWidget(self.quiz_page)     # index 4
         self.stack.addWidget(self.quiz_setup_page)  # index 5
 
+        self.history_ready.connect(self._on_history_ready)
+        self.history_synced.connect(self._on_history_ready)
+        # the sync itself runs off the GUI thread and never waits for the file lock
+        self._sync_timer = QTimer(self)
+        self._sync_timer.timeout.connect(self._sync_history)
+        self._sync_timer.start(self.SYNC_INTERVAL_MS)
         self.navigate("welcome")
 
+    def _on_history_ready(self):
+        for page in (self.matrix_page, self.vector_page, self.spl_page):
+            page.refresh_history()
+
+    def _sync_history(self):
+        if HISTORY.loaded and self.stack.currentWidget() in (self.matrix_page, self.vector_page, self.spl_page):
+            HISTORY.sync_async(self.history_synced.emit)
+
     def navigate(self, target: str):
         targets = {
             "welcome": 0,
@@ -67,6 +89,14 @@ class MainWindow(QMainWindow):
                     self.quiz_page.reset()
                 except Exception:
                     pass
+            if target in ("matrix", "vector", "spl"):
+                # history may have changed (import, other instances) since the page was shown
+                try:
+                    self.stack.widget(targets[target]).refresh_history()
+                except Exception:
+                    pass
+                if HISTORY.loaded:
+                    HISTORY.sync_async(self.history_synced.emit)
             if target == "quiz":
                 try:
                     self.quiz_page.reset()
@@ -82,4 +112,27 @@ def run():
     app.setStyleSheet(app_stylesheet())
     w = MainWindow()
     w.show()
-    sys.exit(app.exec_())
+    HISTORY.load_async(w.history_ready.emit)
+    code = app.exec_()
+    # write history changes still waiting for the debounced autosave
+    HISTORY.close()
+    sys.exit(code)
+
+
+def measure_startup(import_seconds: float = 0.0):
+    """Print how long each startup phase takes, without entering the event loop."""
+    app = QApplication(sys.argv)
+    app.setStyleSheet(app_stylesheet())
+    t0 = time.perf_counter()
+    w = MainWindow()
+    window_seconds = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    HISTORY.ensure_loaded()
+    history_seconds = time.perf_counter() - t0
+    counts = (len(HISTORY.list_matrix()), len(HISTORY.list_vector()), len(HISTORY.list_spl()))
+    print(f"Impor modul        : {import_seconds * 1000:8.1f} ms")
+    print(f"Muat history       : {history_seconds * 1000:8.1f} ms "
+          f"({counts[0]} matriks, {counts[1]} vektor, {counts[2]} SPL)")
+    print(f"Konstruksi jendela : {window_seconds * 1000:8.1f} ms")
+    w.close()
+    HISTORY.close()
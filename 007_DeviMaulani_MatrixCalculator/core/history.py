@@ -1,20 +1,238 @@
-from dataclasses import dataclass
-from typing import List, Any, Optional, Dict
+from collections import OrderedDict, deque
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Iterable, Iterator, List, Any, Optional, Dict, Tuple
+import glob
+import gzip
+import hashlib
 import json
 import os
+import threading
+import time
+import uuid
+import weakref
 import numpy as np
 
+from logic.spl_ops import StepLog
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+def _new_uid() -> str:
+    return uuid.uuid4().hex
+
+
+def _derived_uid(kind: str, pos: int, item: Dict[str, Any]) -> str:
+    # items written before uids existed get one from their content and position,
+    # so every load of the same snapshot agrees with the journal's remove records
+    h = hashlib.sha1(f"{kind}:{pos}:".encode("ascii"))
+    h.update(json.dumps(item, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+    return h.hexdigest()[:32]
+
+
+def _content_key(arr: np.ndarray) -> str:
+    # identical shape, dtype and bytes -> identical key
+    arr = np.ascontiguousarray(arr)
+    h = hashlib.sha1(f"{arr.dtype.str}{arr.shape}".encode("ascii"))
+    h.update(arr.data)
+    return h.hexdigest()
+
+
+def _atomic_write_json(path: str, payload: Any, **dump_kwargs):
+    # write next to the target and rename, so readers never see a half-written file
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, **dump_kwargs)
+    os.replace(tmp, path)
+
+
+KINDS = ("matrix", "vector", "spl")
+
+
+def _open_text(path: str, mode: str):
+    # "*.gz" paths are transparently gzip-compressed
+    if path.endswith(".gz"):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _is_ndjson(path: str) -> bool:
+    name = path[:-3] if path.endswith(".gz") else path
+    return name.endswith((".ndjson", ".jsonl"))
+
+
+def write_history_stream(path: str, records: Callable[[str], Iterable[Dict[str, Any]]], fmt: Optional[str] = None):
+    """Write a history export item by item, so memory use does not grow with its size.
+
+    `records(kind)` yields the serialized items of one category. `fmt` is
+    "json" (indented), "compact" or "ndjson" (one item per line with a "kind"
+    field); by default it follows the file extension.
+    """
+    fmt = fmt or ("ndjson" if _is_ndjson(path) else "json")
+    if fmt not in ("json", "compact", "ndjson"):
+        raise ValueError(f"Format export tidak dikenal: {fmt}")
+    with _open_text(path, "w") as f:
+        if fmt == "ndjson":
+            for kind in KINDS:
+                for item in records(kind):
+                    f.write(json.dumps(dict(kind=kind, **item), ensure_ascii=False, separators=(",", ":")) + "\n")
+            return
+        pretty = fmt == "json"
+        f.write("{\n" if pretty else "{")
+        for k, kind in enumerate(KINDS):
+            f.write(f'  "{kind}": [' if pretty else f'"{kind}":[')
+            count = 0
+            for item in records(kind):
+                sep = "," if count else ""
+                if pretty:
+                    body = json.dumps(item, ensure_ascii=False, indent=2).replace("\n", "\n    ")
+                    f.write(sep + "\n    " + body)
+                else:
+                    f.write(sep + json.dumps(item, ensure_ascii=False, separators=(",", ":")))
+                count += 1
+            if pretty and count:
+                f.write("\n  ")
+            f.write("]" + ("," if k < len(KINDS) - 1 else ""))
+            if pretty:
+                f.write("\n")
+        f.write("}\n" if pretty else "}")
+
+
+class _JSONItemReader:
+    """Incremental reader for {"kind": [item, ...], ...} documents.
+
+    Only the item being decoded is buffered, so large exports can be read
+    without loading the whole document.
+    """
+
+    _CHUNK = 1 << 16
+
+    def __init__(self, f):
+        self._f = f
+        self._buf = ""
+        self._pos = 0
+        self._decoder = json.JSONDecoder()
+
+    def _fill(self, size: int = _CHUNK) -> bool:
+        chunk = self._f.read(size)
+        if not chunk:
+            return False
+        self._buf = self._buf[self._pos:] + chunk
+        self._pos = 0
+        return True
+
+    def _peek(self) -> str:
+        while True:
+            while self._pos < len(self._buf) and self._buf[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buf):
+                return self._buf[self._pos]
+            if not self._fill():
+                return ""
+
+    def _expect(self, ch: str):
+        if self._peek() != ch:
+            raise ValueError(f"Format JSON tidak valid: '{ch}' diharapkan")
+        self._pos += 1
+
+    def _value(self):
+        self._peek()
+        while True:
+            try:
+                value, end = self._decoder.raw_decode(self._buf, self._pos)
+            except json.JSONDecodeError:
+                # incomplete value: grow the buffer geometrically and retry
+                if not self._fill(max(self._CHUNK, len(self._buf))):
+                    raise
+                continue
+            self._pos = end
+            return value
+
+    def items(self) -> Iterator[Tuple[str, Any]]:
+        """Yield (key, element) for list values and (key, value) for anything else."""
+        self._expect("{")
+        if self._peek() == "}":
+            return
+        while True:
+            key = self._value()
+            self._expect(":")
+            if self._peek() == "[":
+                self._pos += 1
+                if self._peek() == "]":
+                    self._pos += 1
+                else:
+                    while True:
+                        yield key, self._value()
+                        if self._peek() != ",":
+                            break
+                        self._pos += 1
+                    self._expect("]")
+            else:
+                yield key, self._value()
+            if self._peek() != ",":
+                break
+            self._pos += 1
+        self._expect("}")
+
+
+def read_history_stream(path: str) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """Yield (kind, item dict) from a file written by write_history_stream (or export_to_file)."""
+    with _open_text(path, "r") as f:
+        if _is_ndjson(path):
+            for line in f:
+                if line.strip():
+                    item = json.loads(line)
+                    yield item.pop("kind", ""), item
+            return
+        yield from _JSONItemReader(f).items()
+
+
+@contextmanager
+def _file_lock(path: str, blocking: bool = True):
+    """Exclusive advisory lock shared by every process using the same history.
+
+    With blocking=False an OSError is raised at once if another process holds it.
+    """
+    with open(path, "a+b") as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX if blocking else fcntl.LOCK_EX | fcntl.LOCK_NB)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK if blocking else msvcrt.LK_NBLCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def _stat_stamp(path: str) -> Optional[Tuple[int, int]]:
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return (st.st_mtime_ns, st.st_size)
+
 
 @dataclass
 class MatrixHistoryItem:
     data: np.ndarray
     label: str
+    uid: str = field(default_factory=_new_uid)
 
 
 @dataclass
 class VectorHistoryItem:
     data: np.ndarray
     label: str
+    uid: str = field(default_factory=_new_uid)
 
 
 @dataclass
@@ -23,139 +241,853 @@ class SPLHistoryItem:
     b: np.ndarray
     method: str
     label: str
+    # plain strings, or a StepLog that is rendered only when the entry is opened
     steps: Optional[List[str]] = None
+    uid: str = field(default_factory=_new_uid)
+
+
+def _steps_nbytes(steps) -> int:
+    if steps is None:
+        return 0
+    if isinstance(steps, StepLog):
+        return steps.nbytes
+    return sum(len(s) for s in steps)
+
+
+def _item_nbytes(item) -> int:
+    if isinstance(item, SPLHistoryItem):
+        return item.A.nbytes + item.b.nbytes + _steps_nbytes(item.steps)
+    return item.data.nbytes
+
+
+class _HistoryRing:
+    """Newest-first container bounded by item count and optionally by bytes.
+
+    Inserting is O(1); when a bound is exceeded the least recently used item
+    (inserted or touched longest ago) is evicted.
+    """
+
+    def __init__(self, limit: int, budget: Optional[int] = None):
+        self.limit = limit
+        self.budget = budget
+        self.nbytes = 0
+        self._items: Deque[Any] = deque()
+        # uid -> item, least recently used first
+        self._recency: "OrderedDict[str, Any]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._items)
+
+    def __getitem__(self, idx: int):
+        return self._items[idx]
+
+    def push(self, item, evict: bool = True) -> List[Any]:
+        self._items.appendleft(item)
+        self._recency[item.uid] = item
+        self.nbytes += _item_nbytes(item)
+        return self.evict() if evict else []
+
+    def push_back(self, item) -> List[Any]:
+        """Add `item` as the oldest entry (used when importing newest-first streams)."""
+        self._items.append(item)
+        self._recency[item.uid] = item
+        self._recency.move_to_end(item.uid, last=False)
+        self.nbytes += _item_nbytes(item)
+        return self.evict()
+
+    def touch(self, idx: int):
+        self._recency.move_to_end(self._items[idx].uid)
+
+    def contains(self, uid: str) -> bool:
+        return uid in self._recency
+
+    def pop(self, idx: int):
+        item = self._items[idx]
+        del self._items[idx]
+        self._forget(item)
+        return item
+
+    def discard(self, uid: str) -> bool:
+        item = self._recency.get(uid)
+        if item is None:
+            return False
+        self._drop(item)
+        return True
+
+    def evict(self) -> List[Any]:
+        evicted = []
+        # the newest item always stays, even if it alone exceeds the budget
+        while len(self._items) > self.limit or (
+            self.budget is not None and self.nbytes > self.budget and len(self._items) > 1
+        ):
+            _, item = next(iter(self._recency.items()))
+            self._drop(item)
+            evicted.append(item)
+        return evicted
+
+    def reset(self, items: Iterable[Any]):
+        self._items.clear()
+        self._recency.clear()
+        self.nbytes = 0
+        for item in reversed(list(items)):
+            self.push(item, evict=False)
+
+    def checkpoint(self):
+        """Shallow copy of the contents and recency order, for rollback()."""
+        return deque(self._items), OrderedDict(self._recency), self.nbytes
+
+    def rollback(self, state):
+        self._items, self._recency, self.nbytes = state
+
+    def _drop(self, item):
+        # the LRU victim is normally the oldest entry, so eviction is O(1); only
+        # entries touched out of order need a scan. Identity lookup: dataclass
+        # equality would compare the arrays.
+        if self._items and self._items[-1] is item:
+            self._items.pop()
+        elif self._items and self._items[0] is item:
+            self._items.popleft()
+        else:
+            for i, it in enumerate(reversed(self._items)):
+                if it is item:
+                    del self._items[-1 - i]
+                    break
+        self._forget(item)
+
+    def _forget(self, item):
+        del self._recency[item.uid]
+        self.nbytes -= _item_nbytes(item)
 
 
 class HistoryManager:
-    def __init__(self, limit: int = 50, storage_path: Optional[str] = None):
+    """In-memory history persisted to a JSON or .npy snapshot, optionally with a journal.
+
+    In journal mode several processes can share one storage path: every write
+    happens under a file lock and first picks up the records other processes
+    appended (merge-on-write), and sync() does the same on demand by reading
+    only the new journal tail. Without the journal the last snapshot written wins.
+    """
+
+    def __init__(
+        self,
+        limit: int = 50,
+        storage_path: Optional[str] = None,
+        journal: bool = False,
+        compact_every: int = 100,
+        storage_format: str = "json",
+        mmap: bool = True,
+        autosave_delay: Optional[float] = None,
+        lazy: bool = False,
+        budget_bytes: Optional[Dict[str, int]] = None,
+    ):
         self.limit = limit
-        self._matrix: List[MatrixHistoryItem] = []
-        self._vector: List[VectorHistoryItem] = []
-        self._spl: List[SPLHistoryItem] = []
+        # optional per-category memory budget, e.g. {"spl": 8 * 2**20}
+        budget_bytes = budget_bytes or {}
+        self._matrix = _HistoryRing(limit, budget_bytes.get("matrix"))
+        self._vector = _HistoryRing(limit, budget_bytes.get("vector"))
+        self._spl = _HistoryRing(limit, budget_bytes.get("spl"))
         # default persistent storage location in user home
         home = os.path.expanduser("~")
         default_name = ".kalkulator_aljabar_history.json"
         self.storage_path = storage_path or os.path.join(home, default_name)
-        # try load existing history
+        # journal mode: each mutation is appended to <storage>.journal and
+        # folded into the snapshot every `compact_every` records
+        self.journal = journal
+        self.compact_every = compact_every
+        self._journal_count = 0
+        # how far this process has read the journal, and which snapshot it loaded;
+        # a changed snapshot means another process compacted in the meantime
+        self._journal_offset = 0
+        self._snapshot_stamp: Optional[Tuple[int, int]] = None
+        # "json" keeps everything in one JSON document; "npy" keeps a small
+        # JSON index next to a flat float64 .npy payload that is memory-mapped on load
+        if storage_format not in ("json", "npy"):
+            raise ValueError(f"Format penyimpanan tidak dikenal: {storage_format}")
+        self.storage_format = storage_format
+        self.mmap = mmap
+        # _lock guards the item lists, _io_lock serializes writes to disk
+        self._lock = threading.RLock()
+        self._io_lock = threading.Lock()
+        # content-addressed arrays shared by every item holding the same payload;
+        # entries disappear once no item references them anymore
+        self._blobs: "weakref.WeakValueDictionary[str, np.ndarray]" = weakref.WeakValueDictionary()
+        # with a delay, writes happen on a background thread once mutations
+        # have been quiet for `autosave_delay` seconds
+        self._worker: Optional[_AutosaveWorker] = None
+        if autosave_delay is not None:
+            self._worker = _AutosaveWorker(self, autosave_delay)
+            self._worker.start()
+        # lazy managers read the storage on first access (or via load_async)
+        self._loaded = False
+        self._load_lock = threading.Lock()
+        self._sync_thread: Optional[threading.Thread] = None
+        # mutations already in memory but not yet written; a reload re-applies them
+        self._unsaved: List[Dict[str, Any]] = []
+        if not lazy:
+            self.ensure_loaded()
+
+    @property
+    def journal_path(self) -> str:
+        return self.storage_path + ".journal"
+
+    @property
+    def lock_path(self) -> str:
+        return self.storage_path + ".lock"
+
+    # Loading
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def ensure_loaded(self):
+        """Load the persisted history once; later calls return immediately."""
+        if self._loaded:
+            return
+        with self._load_lock:
+            if self._loaded:
+                return
+            # try load existing history
+            try:
+                with _file_lock(self.lock_path):
+                    self._reload()
+            except Exception:
+                # ignore load errors to avoid blocking app startup
+                pass
+            self._loaded = True
+
+    def sync(self, blocking: bool = True) -> bool:
+        """Pick up entries other processes appended since the last read.
+
+        Only the unread journal tail is parsed, unless another process has
+        compacted the journal into a new snapshot. Returns True if anything was
+        read. With blocking=False nothing is read while a write is in progress.
+        """
+        if not self.journal:
+            return False
+        self.ensure_loaded()
+        if not self._io_lock.acquire(blocking=blocking):
+            return False
         try:
-            if os.path.exists(self.storage_path):
-                self.load_from_file(self.storage_path)
+            with _file_lock(self.lock_path, blocking=blocking):
+                return self._sync_locked()
         except Exception:
-            # ignore load errors to avoid blocking app startup
-            pass
+            # a failed or skipped refresh keeps the current in-memory history
+            return False
+        finally:
+            self._io_lock.release()
+
+    def sync_async(self, on_changed: Optional[Callable[[], None]] = None) -> Optional[threading.Thread]:
+        """Non-blocking sync() on a background thread; `on_changed` is called from it if anything was read.
+
+        Returns None if a previous background sync is still running.
+        """
+        if self._sync_thread is not None and self._sync_thread.is_alive():
+            return None
+
+        def work():
+            if self.sync(blocking=False) and on_changed is not None:
+                on_changed()
+
+        self._sync_thread = threading.Thread(target=work, name="history-sync", daemon=True)
+        self._sync_thread.start()
+        return self._sync_thread
+
+    def load_async(self, on_ready: Optional[Callable[[], None]] = None) -> threading.Thread:
+        """Load the history on a background thread and call `on_ready` from it afterwards."""
+        def work():
+            self.ensure_loaded()
+            if on_ready is not None:
+                on_ready()
+
+        thread = threading.Thread(target=work, name="history-load", daemon=True)
+        thread.start()
+        return thread
 
     # Matrix
     def add_matrix(self, arr: np.ndarray, label: Optional[str] = None):
+        self.ensure_loaded()
         label = label or f"Matriks {arr.shape[0]}x{arr.shape[1]}"
-        self._matrix.insert(0, MatrixHistoryItem(arr.copy(), label))
-        self._matrix = self._matrix[: self.limit]
-        self._autosave()
+        data = self._intern(arr, copy=True)
+        if self._same_as_head("matrix", label, data=data):
+            return
+        item = MatrixHistoryItem(data, label)
+        self._add("matrix", item)
+
+    def list_matrix(
+        self, offset: int = 0, limit: Optional[int] = None, shape: Optional[Tuple[int, int]] = None
+    ) -> List[MatrixHistoryItem]:
+        return self._page("matrix", offset, limit, lambda it: shape is None or it.data.shape == tuple(shape))
 
-    def list_matrix(self) -> List[MatrixHistoryItem]:
-        return list(self._matrix)
-    
     def remove_matrix(self, idx: int) -> bool:
-        if 0 <= idx < len(self._matrix):
-            del self._matrix[idx]
-            self._autosave()
-            return True
-        return False
+        return self._remove("matrix", idx)
+
+    def touch_matrix(self, idx: int):
+        self._touch("matrix", idx)
 
     # Vector
     def add_vector(self, vec: np.ndarray, label: Optional[str] = None):
+        self.ensure_loaded()
         label = label or f"Vektor dim {vec.shape[0]}"
-        self._vector.insert(0, VectorHistoryItem(vec.copy(), label))
-        self._vector = self._vector[: self.limit]
-        self._autosave()
+        data = self._intern(vec, copy=True)
+        if self._same_as_head("vector", label, data=data):
+            return
+        item = VectorHistoryItem(data, label)
+        self._add("vector", item)
+
+    def list_vector(self, offset: int = 0, limit: Optional[int] = None) -> List[VectorHistoryItem]:
+        return self._page("vector", offset, limit)
 
-    def list_vector(self) -> List[VectorHistoryItem]:
-        return list(self._vector)
-    
     def remove_vector(self, idx: int) -> bool:
-        if 0 <= idx < len(self._vector):
-            del self._vector[idx]
-            self._autosave()
-            return True
-        return False
+        return self._remove("vector", idx)
+
+    def touch_vector(self, idx: int):
+        self._touch("vector", idx)
 
     # SPL
     def add_spl(self, A: np.ndarray, b: np.ndarray, method: str, steps: Optional[List[str]] = None, label: Optional[str] = None):
+        self.ensure_loaded()
         label = label or f"SPL {A.shape[0]}x{A.shape[1]} (metode {method})"
-        self._spl.insert(0, SPLHistoryItem(A.copy(), b.copy(), method, label, steps or []))
-        self._spl = self._spl[: self.limit]
-        self._autosave()
+        A = self._intern(A, copy=True)
+        b = self._intern(b, copy=True)
+        if self._same_as_head("spl", label, A=A, b=b, method=method):
+            return
+        if isinstance(steps, StepLog):
+            # the caller usually rendered the log already; the entry re-renders on open
+            steps = steps.detached()
+        item = SPLHistoryItem(A, b, method, label, steps if steps is not None else [])
+        self._add("spl", item)
+
+    def list_spl(
+        self,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        shape: Optional[Tuple[int, int]] = None,
+        method: Optional[str] = None,
+    ) -> List[SPLHistoryItem]:
+        def keep(it) -> bool:
+            return (shape is None or it.A.shape == tuple(shape)) and (method is None or it.method == method)
+
+        return self._page("spl", offset, limit, keep)
 
-    def list_spl(self) -> List[SPLHistoryItem]:
-        return list(self._spl)
-    
     def remove_spl(self, idx: int) -> bool:
-        if 0 <= idx < len(self._spl):
-            del self._spl[idx]
-            self._autosave()
-            return True
-        return False
+        return self._remove("spl", idx)
+
+    def touch_spl(self, idx: int):
+        self._touch("spl", idx)
+
+    # Memory accounting
+    def labels(self, kind: str, offset: int = 0, limit: Optional[int] = None) -> List[str]:
+        """Labels of one category, newest first, in the order of list_*()."""
+        return [it.label for it in self._page(kind, offset, limit)]
+
+    def memory_usage(self) -> Dict[str, int]:
+        """Bytes held per category, plus "total" counting shared arrays only once."""
+        self.ensure_loaded()
+        with self._lock:
+            usage = {kind: self._items(kind).nbytes for kind in ("matrix", "vector", "spl")}
+            steps = sum(_steps_nbytes(it.steps) for it in self._spl)
+            usage["total"] = sum(arr.nbytes for arr in self._blobs.values()) + steps
+        return usage
+
+    # Shared list helpers
+    def _items(self, kind: str) -> _HistoryRing:
+        return {"matrix": self._matrix, "vector": self._vector, "spl": self._spl}[kind]
+
+    def _page(self, kind: str, offset: int, limit: Optional[int], keep: Optional[Callable[[Any], bool]] = None) -> list:
+        # newest first; indices passed to remove_*/touch_* refer to the unfiltered listing
+        self.ensure_loaded()
+        with self._lock:
+            items = [it for it in self._items(kind) if keep is None or keep(it)]
+        end = None if limit is None else offset + limit
+        return items[offset:end]
+
+    def _add(self, kind: str, item):
+        with self._lock:
+            evicted = self._items(kind).push(item)
+            # evictions are journaled so a replay does not depend on recency it cannot see
+            records = [{"op": "add", "kind": kind, "item": item}]
+            records += [{"op": "remove", "kind": kind, "id": old.uid} for old in evicted]
+            self._unsaved += records
+        for record in records:
+            self._autosave(record)
+
+    def _remove(self, kind: str, idx: int) -> bool:
+        self.ensure_loaded()
+        with self._lock:
+            items = self._items(kind)
+            if not 0 <= idx < len(items):
+                return False
+            record = {"op": "remove", "kind": kind, "id": items.pop(idx).uid}
+            self._unsaved.append(record)
+        self._autosave(record)
+        return True
+
+    def _touch(self, kind: str, idx: int):
+        self.ensure_loaded()
+        with self._lock:
+            items = self._items(kind)
+            if 0 <= idx < len(items):
+                items.touch(idx)
+
+    def _intern(self, arr: np.ndarray, key: Optional[str] = None, copy: bool = False) -> np.ndarray:
+        """Return the shared read-only array for this content, registering it if new."""
+        key = key or _content_key(arr)
+        with self._lock:
+            shared = self._blobs.get(key)
+            if shared is None:
+                shared = arr.copy() if copy else arr
+                shared.setflags(write=False)
+                self._blobs[key] = shared
+        return shared
+
+    def _same_as_head(self, kind: str, label: str, **fields) -> bool:
+        # repeating the last action on unchanged input does not create a new entry;
+        # interned arrays make the payload comparison an identity check
+        with self._lock:
+            items = self._items(kind)
+            if not items or items[0].label != label:
+                return False
+            head = items[0]
+            return all(getattr(head, name) is value if isinstance(value, np.ndarray) else getattr(head, name) == value
+                       for name, value in fields.items())
+
+    def _snapshot_items(self) -> Dict[str, list]:
+        self.ensure_loaded()
+        # shallow copies are enough: items are never mutated after insertion
+        with self._lock:
+            return {kind: list(self._items(kind)) for kind in ("matrix", "vector", "spl")}
+
+    # Serialization of single items
+    @staticmethod
+    def _item_to_dict(
+        kind: str,
+        it,
+        store: Optional[Callable[[str, np.ndarray], Dict[str, Any]]] = None,
+        render_steps: bool = False,
+    ) -> Dict[str, Any]:
+        # `store` decides how arrays are written; by default they are inlined as lists.
+        # Step logs are stored compressed unless readable text is asked for (exports).
+        def put(name: str, arr: np.ndarray) -> Dict[str, Any]:
+            return store(name, arr) if store is not None else {name: arr.tolist()}
+
+        if kind == "spl":
+            d = {"id": it.uid, "label": it.label, "method": it.method}
+            d.update(put("A", it.A))
+            d.update(put("b", it.b))
+            if isinstance(it.steps, StepLog) and not render_steps:
+                d["ops"] = it.steps.to_compressed()
+            else:
+                d["steps"] = list(it.steps) if it.steps is not None else []
+            return d
+        d = {"id": it.uid, "label": it.label}
+        d.update(put("data", it.data))
+        return d
+
+    def _array_from_dict(
+        self,
+        item: Dict[str, Any],
+        name: str,
+        payload: Optional[np.ndarray] = None,
+        arrays: Optional[Dict[str, Any]] = None,
+    ) -> np.ndarray:
+        ref = item.get(name + "_ref")
+        if ref is not None and payload is not None:
+            shape = tuple(ref["shape"])
+            size = int(np.prod(shape, dtype=np.int64))
+            view = payload[ref["offset"]: ref["offset"] + size].reshape(shape)
+            # the stored key avoids hashing (and thus reading) the mapped bytes
+            return self._intern(view, ref.get("key"))
+        key = item.get(name + "_key")
+        if key is not None and arrays is not None:
+            return self._intern(np.array(arrays[key], dtype=float), key)
+        return self._intern(np.array(item.get(name, []), dtype=float))
+
+    def _item_from_dict(
+        self,
+        kind: str,
+        item: Dict[str, Any],
+        payload: Optional[np.ndarray] = None,
+        arrays: Optional[Dict[str, Any]] = None,
+        pos: int = 0,
+    ):
+        uid = item.get("id") or _derived_uid(kind, pos, item)
+        if kind == "matrix":
+            return MatrixHistoryItem(self._array_from_dict(item, "data", payload, arrays), item.get("label", "Matriks"), uid)
+        if kind == "vector":
+            return VectorHistoryItem(self._array_from_dict(item, "data", payload, arrays), item.get("label", "Vektor"), uid)
+        A = self._array_from_dict(item, "A", payload, arrays)
+        b = self._array_from_dict(item, "b", payload, arrays)
+        method = item.get("method", "")
+        label = item.get("label", "SPL")
+        if "ops" in item:
+            steps = StepLog.from_compressed(A, b, item["ops"])
+        else:
+            steps = item.get("steps", [])
+        return SPLHistoryItem(A, b, method, label, steps, uid)
 
     # Export utilities
-    def to_dict(self) -> Dict[str, Any]:
-        return {
-            "matrix": [
-                {"label": it.label, "data": it.data.tolist()} for it in self._matrix
-            ],
-            "vector": [
-                {"label": it.label, "data": it.data.tolist()} for it in self._vector
-            ],
-            "spl": [
-                {
-                    "label": it.label,
-                    "method": it.method,
-                    "A": it.A.tolist(),
-                    "b": it.b.tolist(),
-                    "steps": list(it.steps or []),
-                }
-                for it in self._spl
-            ],
+    def to_dict(self, storage: bool = False) -> Dict[str, Any]:
+        """Plain dict of the history.
+
+        The `storage` form writes each distinct array once under "arrays" and
+        keeps step logs compressed; otherwise everything is inlined as readable text.
+        """
+        store = None
+        arrays: Dict[str, Any] = {}
+        if storage:
+            def store(name: str, arr: np.ndarray) -> Dict[str, Any]:
+                key = _content_key(arr)
+                if key not in arrays:
+                    arrays[key] = arr.tolist()
+                return {name + "_key": key}
+
+        result: Dict[str, Any] = {
+            kind: [self._item_to_dict(kind, it, store, render_steps=not storage) for it in items]
+            for kind, items in self._snapshot_items().items()
         }
+        if storage:
+            result["arrays"] = arrays
+        return result
+
+    def iter_export(self, kind: str) -> Iterator[Dict[str, Any]]:
+        """Serialized items of one category, newest first, converted one at a time."""
+        self.ensure_loaded()
+        with self._lock:
+            items = list(self._items(kind))
+        for it in items:
+            yield self._item_to_dict(kind, it, render_steps=True)
+
+    def export_to_file(self, file_path: str, fmt: Optional[str] = None):
+        """Stream the history to `file_path` ("json", "compact" or "ndjson"; "*.gz" is gzipped)."""
+        write_history_stream(file_path, self.iter_export, fmt)
 
-    def export_to_file(self, file_path: str):
-        payload = self.to_dict()
-        with open(file_path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+    def import_from_file(self, file_path: str, replace: bool = False) -> int:
+        """Read an export item by item; imported entries rank below the current ones.
+
+        Returns the number of entries added and still kept within the limits.
+        If the file turns out to be invalid part way, the history is left exactly as it was.
+        """
+        self.ensure_loaded()
+        added = set()
+        seen = dict.fromkeys(KINDS, 0)
+        with self._lock:
+            saved = {kind: self._items(kind).checkpoint() for kind in KINDS}
+            try:
+                if replace:
+                    for kind in KINDS:
+                        self._items(kind).reset([])
+                for kind, item in read_history_stream(file_path):
+                    if kind not in KINDS or not isinstance(item, dict):
+                        continue
+                    if any(key.endswith(("_key", "_ref")) for key in item):
+                        raise ValueError("File ini adalah snapshot penyimpanan, bukan hasil export history")
+                    it = self._item_from_dict(kind, item, pos=seen[kind])
+                    seen[kind] += 1
+                    ring = self._items(kind)
+                    if ring.contains(it.uid):
+                        continue
+                    added.add(it.uid)
+                    # past the limit the imported entry is the least recently used one
+                    for gone in ring.push_back(it):
+                        added.discard(gone.uid)
+            except BaseException:
+                # nothing was persisted yet, so restoring memory undoes the import
+                for kind in KINDS:
+                    self._items(kind).rollback(saved[kind])
+                raise
+        # an import touches many entries at once: write a fresh snapshot
+        if self.journal:
+            self.compact()
+        else:
+            self._autosave()
+        return len(added)
 
     # Persistent storage helpers
     def save_to_file(self, file_path: Optional[str] = None):
         path = file_path or self.storage_path
-        payload = self.to_dict()
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(payload, f, ensure_ascii=False, indent=2)
+        if self.storage_format == "npy":
+            self._save_binary(path)
+        else:
+            _atomic_write_json(path, self.to_dict(storage=True), indent=2)
+        if path == self.storage_path:
+            self._snapshot_stamp = _stat_stamp(path)
 
     def load_from_file(self, file_path: Optional[str] = None):
         path = file_path or self.storage_path
         with open(path, "r", encoding="utf-8") as f:
             data = json.load(f)
+        # binary index: arrays live in a separate .npy payload next to it
+        payload = None
+        if data.get("format") == "npy-index":
+            payload_path = os.path.join(os.path.dirname(path), data["payload"])
+            payload = np.load(payload_path, mmap_mode="r" if self.mmap else None)
+        arrays = data.get("arrays")
         # reconstruct lists
-        self._matrix = [
-            MatrixHistoryItem(np.array(item.get("data", []), dtype=float), item.get("label", "Matriks"))
-            for item in data.get("matrix", [])
-        ]
-        self._vector = [
-            VectorHistoryItem(np.array(item.get("data", []), dtype=float), item.get("label", "Vektor"))
-            for item in data.get("vector", [])
-        ]
-        self._spl = []
-        for item in data.get("spl", []):
-            A = np.array(item.get("A", []), dtype=float)
-            b = np.array(item.get("b", []), dtype=float)
-            method = item.get("method", "")
-            label = item.get("label", "SPL")
-            steps = item.get("steps", [])
-            self._spl.append(SPLHistoryItem(A, b, method, label, steps))
+        with self._lock:
+            for kind in ("matrix", "vector", "spl"):
+                self._items(kind).reset(
+                    self._item_from_dict(kind, item, payload, arrays, pos)
+                    for pos, item in enumerate(data.get(kind, []))
+                )
+            # the journal only belongs to the default storage snapshot
+            if path == self.storage_path:
+                self._snapshot_stamp = _stat_stamp(path)
+                if self.journal:
+                    self._replay_journal()
+            for kind in ("matrix", "vector", "spl"):
+                self._items(kind).evict()
+        # an explicit load replaces whatever the lazy load would have read
+        self._loaded = True
+
+    def _save_binary(self, path: str):
+        chunks: List[np.ndarray] = []
+        offsets: Dict[str, int] = {}
+        offset = 0
 
-    def _autosave(self):
+        def store(name: str, arr: np.ndarray) -> Dict[str, Any]:
+            nonlocal offset
+            key = _content_key(arr)
+            # identical payloads are written once and shared by offset
+            if key not in offsets:
+                flat = np.ascontiguousarray(arr, dtype=float).ravel()
+                chunks.append(flat)
+                offsets[key] = offset
+                offset += flat.size
+            return {name + "_ref": {"offset": offsets[key], "shape": list(arr.shape), "key": key}}
+
+        index: Dict[str, Any] = {"format": "npy-index"}
+        for kind, items in self._snapshot_items().items():
+            index[kind] = [self._item_to_dict(kind, it, store) for it in items]
+
+        # each snapshot gets a fresh payload name, so the index never points to a
+        # half-written payload and a payload that is still mapped is never overwritten
+        payload_name = f"{os.path.basename(path)}.{uuid.uuid4().hex[:8]}.npy"
+        index["payload"] = payload_name
+        payload_path = os.path.join(os.path.dirname(path), payload_name)
+        with open(payload_path, "wb") as f:
+            np.save(f, np.concatenate(chunks) if chunks else np.zeros(0))
+        _atomic_write_json(path, index, separators=(",", ":"))
+        for old in glob.glob(glob.escape(path) + ".*.npy"):
+            if os.path.basename(old) != payload_name:
+                try:
+                    os.remove(old)
+                except OSError:
+                    # still mapped by a live array on some platforms; removed next time
+                    pass
+
+    # Journal helpers
+    def compact(self):
+        """Fold the journal into a fresh snapshot and truncate it."""
+        self.ensure_loaded()
+        with self._io_lock, _file_lock(self.lock_path):
+            if self.journal:
+                self._sync_locked()
+            self._compact_locked()
+
+    def _compact_locked(self):
+        self.save_to_file()
+        if os.path.exists(self.journal_path):
+            open(self.journal_path, "w").close()
+        self._journal_offset = 0
+        self._journal_count = 0
+
+    def _reload(self):
+        # full read of snapshot + journal; mutations not yet on disk are re-applied.
+        # They are read under _lock after the reset, so an add racing with the
+        # reload is either already in the list or pushed after it.
+        with self._lock:
+            if os.path.exists(self.storage_path):
+                self.load_from_file(self.storage_path)
+            else:
+                for kind in ("matrix", "vector", "spl"):
+                    self._items(kind).reset([])
+                self._snapshot_stamp = None
+                if self.journal:
+                    self._replay_journal()
+            for record in self._unsaved:
+                self._apply_record(record)
+            for kind in ("matrix", "vector", "spl"):
+                self._items(kind).evict()
+
+    def _sync_locked(self) -> bool:
+        journal_size = _stat_stamp(self.journal_path)
+        if _stat_stamp(self.storage_path) != self._snapshot_stamp or (
+            journal_size is not None and journal_size[1] < self._journal_offset
+        ):
+            self._reload()
+            return True
+        before = self._journal_offset
+        with self._lock:
+            self._replay_journal(self._journal_offset)
+            if self._journal_offset != before:
+                # our unsaved entries are written after the foreign ones, so they
+                # move back in front to keep memory in journal order
+                for record in self._unsaved:
+                    items = self._items(record["kind"])
+                    if record["op"] == "add" and items.discard(record["item"].uid):
+                        items.push(record["item"], evict=False)
+            for kind in ("matrix", "vector", "spl"):
+                self._items(kind).evict()
+        return self._journal_offset != before
+
+    def _append_journal(self, records: List[Dict[str, Any]]):
+        lines = []
+        for record in records:
+            if "item" in record:
+                record = dict(record, item=self._item_to_dict(record["kind"], record["item"]))
+            lines.append(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+        data = "".join(lines).encode("utf-8")
+        with _file_lock(self.lock_path):
+            # merge-on-write: apply what other processes appended before adding ours
+            self._sync_locked()
+            # one write call per batch of coalesced mutations
+            with open(self.journal_path, "a+b") as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() > 0:
+                    f.seek(-1, os.SEEK_END)
+                    if f.read(1) != b"\n":
+                        # never glue a record onto a torn line left by a crash
+                        data = b"\n" + data
+                f.write(data)
+                self._journal_offset = f.tell()
+            self._journal_count += len(lines)
+            if self._journal_count >= self.compact_every:
+                self._compact_locked()
+
+    def _replay_journal(self, offset: int = 0):
+        if not os.path.exists(self.journal_path):
+            self._journal_offset = 0
+            return
+        with open(self.journal_path, "rb") as f:
+            f.seek(offset)
+            data = f.read()
+        # only complete lines; a line still being written is read next time
+        end = data.rfind(b"\n") + 1
+        count = 0
+        for line in data[:end].splitlines():
+            try:
+                record = json.loads(line.decode("utf-8"))
+            except ValueError:
+                # torn line after a crash
+                continue
+            self._apply_record(record)
+            count += 1
+        self._journal_offset = offset + end
+        self._journal_count = (self._journal_count if offset else 0) + count
+
+    def _apply_record(self, record: Dict[str, Any]):
+        kind = record.get("kind")
+        if kind not in ("matrix", "vector", "spl"):
+            return
+        items = self._items(kind)
+        if record.get("op") == "add":
+            item = record.get("item", {})
+            # unsaved records of this process still carry the item object itself
+            if isinstance(item, dict):
+                item = self._item_from_dict(kind, item)
+            # records may already be part of the snapshot if compaction was interrupted
+            if items.contains(item.uid):
+                return
+            # bounds are enforced once the whole journal has been replayed
+            items.push(item, evict=False)
+        elif record.get("op") == "remove":
+            items.discard(record.get("id"))
+
+    # Autosave
+    def flush(self):
+        """Write any mutation still waiting for the background autosave."""
+        if self._worker is not None:
+            self._worker.flush()
+
+    def close(self):
+        """Flush pending writes and stop the background autosave thread."""
+        if self._worker is not None:
+            self._worker.stop()
+            self._worker = None
+
+    def _autosave(self, record: Optional[Dict[str, Any]] = None):
+        if self._worker is not None:
+            self._worker.schedule(record)
+        else:
+            with self._io_lock:
+                self._persist([record])
+
+    def _persist(self, records: List[Optional[Dict[str, Any]]]):
         try:
-            self.save_to_file()
+            if self.journal and all(r is not None for r in records):
+                self._append_journal(records)
+            else:
+                with _file_lock(self.lock_path):
+                    self.save_to_file()
         except Exception:
             pass
+        with self._lock:
+            done = {id(r) for r in records}
+            self._unsaved = [r for r in self._unsaved if id(r) not in done]
+
+
+class _AutosaveWorker(threading.Thread):
+    """Coalesces bursts of history mutations into one write after a quiet period."""
+
+    def __init__(self, manager: HistoryManager, delay: float):
+        super().__init__(name="history-autosave", daemon=True)
+        self._manager = manager
+        self._delay = delay
+        self._cond = threading.Condition()
+        self._pending: List[Optional[Dict[str, Any]]] = []
+        self._last_change = 0.0
+        self._stopped = False
+
+    def schedule(self, record: Optional[Dict[str, Any]]):
+        with self._cond:
+            self._pending.append(record)
+            self._last_change = time.monotonic()
+            self._cond.notify()
+
+    def run(self):
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                if self._stopped and not self._pending:
+                    return
+                # debounce: restart the wait every time a new mutation arrives
+                while not self._stopped:
+                    remaining = self._last_change + self._delay - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._cond.wait(remaining)
+            self._write_pending()
+
+    def _write_pending(self):
+        # taking the batch under _io_lock keeps journal records in mutation order
+        with self._manager._io_lock:
+            with self._cond:
+                records, self._pending = self._pending, []
+            if records:
+                self._manager._persist(records)
+
+    def flush(self):
+        self._write_pending()
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify()
+        self.join()
+        self._write_pending()
+
+
+def _create_default_history():
+    # KALKULATOR_HISTORY_BACKEND=sqlite switches to the SQLite store
+    if os.environ.get("KALKULATOR_HISTORY_BACKEND", "").lower() == "sqlite":
+        from core.history_sqlite import SQLiteHistoryManager
+        return SQLiteHistoryManager(lazy=True)
+    return HistoryManager(journal=True, storage_format="npy", autosave_delay=0.5, lazy=True)
 
 
 # Singleton instance
-HISTORY = HistoryManager()
+HISTORY = _create_default_history()
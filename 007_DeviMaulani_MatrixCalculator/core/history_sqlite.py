@@ -0,0 +1,449 @@
+from typing import Callable, Iterator, List, Any, Optional, Dict, Tuple
+import json
+import os
+import sqlite3
+import threading
+import time
+import numpy as np
+
+from logic.spl_ops import StepLog
+from core.history import (
+    KINDS,
+    HistoryManager,
+    MatrixHistoryItem,
+    VectorHistoryItem,
+    SPLHistoryItem,
+    _content_key,
+    _derived_uid,
+    _new_uid,
+    read_history_stream,
+    write_history_stream,
+)
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS arrays (
+    hash  TEXT PRIMARY KEY,
+    dtype TEXT NOT NULL,
+    shape TEXT NOT NULL,
+    data  BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS items (
+    seq       INTEGER PRIMARY KEY AUTOINCREMENT,
+    uid       TEXT NOT NULL UNIQUE,
+    category  TEXT NOT NULL,
+    label     TEXT NOT NULL,
+    method    TEXT,
+    rows      INTEGER,
+    cols      INTEGER,
+    a_hash    TEXT NOT NULL REFERENCES arrays(hash),
+    b_hash    TEXT REFERENCES arrays(hash),
+    steps     TEXT,
+    created   REAL NOT NULL,
+    last_used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS items_category ON items(category, seq);
+CREATE INDEX IF NOT EXISTS items_shape ON items(category, rows, cols, seq);
+CREATE INDEX IF NOT EXISTS items_method ON items(category, method, seq);
+CREATE INDEX IF NOT EXISTS items_recency ON items(category, last_used, seq);
+CREATE INDEX IF NOT EXISTS items_a_hash ON items(a_hash);
+CREATE INDEX IF NOT EXISTS items_b_hash ON items(b_hash);
+"""
+
+
+class SQLiteHistoryManager:
+    """History backed by a local SQLite database (WAL mode).
+
+    Offers the same interface as HistoryManager, but entries live in indexed
+    rows instead of in memory: listing pages through the table, and adding or
+    removing an entry touches only that row and its arrays. Array payloads are
+    stored once per content hash as raw bytes.
+    """
+
+    def __init__(self, limit: Optional[int] = 10000, storage_path: Optional[str] = None, lazy: bool = False):
+        self.limit = limit
+        home = os.path.expanduser("~")
+        default_name = ".kalkulator_aljabar_history.sqlite3"
+        self.storage_path = storage_path or os.path.join(home, default_name)
+        self._lock = threading.RLock()
+        self._conn: Optional[sqlite3.Connection] = None
+        if not lazy:
+            self.ensure_loaded()
+
+    # Connection
+    @property
+    def loaded(self) -> bool:
+        return self._conn is not None
+
+    def ensure_loaded(self):
+        """Open the database and create the schema if needed."""
+        with self._lock:
+            if self._conn is not None:
+                return
+            # the connection is shared by the GUI thread and load_async, guarded by _lock
+            conn = sqlite3.connect(self.storage_path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+
+    def load_async(self, on_ready: Optional[Callable[[], None]] = None) -> threading.Thread:
+        def work():
+            self.ensure_loaded()
+            if on_ready is not None:
+                on_ready()
+
+        thread = threading.Thread(target=work, name="history-load", daemon=True)
+        thread.start()
+        return thread
+
+    def sync(self, blocking: bool = True) -> bool:
+        # queries always read the shared database, nothing to pick up
+        return False
+
+    def sync_async(self, on_changed: Optional[Callable[[], None]] = None) -> Optional[threading.Thread]:
+        return None
+
+    def flush(self):
+        # every mutation is committed immediately
+        pass
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    # Matrix
+    def add_matrix(self, arr: np.ndarray, label: Optional[str] = None):
+        label = label or f"Matriks {arr.shape[0]}x{arr.shape[1]}"
+        self._add("matrix", label, arr)
+
+    def list_matrix(
+        self, offset: int = 0, limit: Optional[int] = None, shape: Optional[Tuple[int, int]] = None
+    ) -> List[MatrixHistoryItem]:
+        return self._query("matrix", offset, limit, shape=shape)
+
+    def remove_matrix(self, idx: int) -> bool:
+        return self._remove("matrix", idx)
+
+    def touch_matrix(self, idx: int):
+        self._touch("matrix", idx)
+
+    # Vector
+    def add_vector(self, vec: np.ndarray, label: Optional[str] = None):
+        label = label or f"Vektor dim {vec.shape[0]}"
+        self._add("vector", label, vec)
+
+    def list_vector(self, offset: int = 0, limit: Optional[int] = None) -> List[VectorHistoryItem]:
+        return self._query("vector", offset, limit)
+
+    def remove_vector(self, idx: int) -> bool:
+        return self._remove("vector", idx)
+
+    def touch_vector(self, idx: int):
+        self._touch("vector", idx)
+
+    # SPL
+    def add_spl(self, A: np.ndarray, b: np.ndarray, method: str, steps: Optional[List[str]] = None, label: Optional[str] = None):
+        label = label or f"SPL {A.shape[0]}x{A.shape[1]} (metode {method})"
+        self._add("spl", label, A, b, method, steps if steps is not None else [])
+
+    def list_spl(
+        self,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        shape: Optional[Tuple[int, int]] = None,
+        method: Optional[str] = None,
+    ) -> List[SPLHistoryItem]:
+        return self._query("spl", offset, limit, shape=shape, method=method)
+
+    def remove_spl(self, idx: int) -> bool:
+        return self._remove("spl", idx)
+
+    def touch_spl(self, idx: int):
+        self._touch("spl", idx)
+
+    def labels(self, kind: str, offset: int = 0, limit: Optional[int] = None) -> List[str]:
+        """Labels of one category, newest first, without reading arrays or step logs."""
+        self.ensure_loaded()
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT label FROM items WHERE category = ? ORDER BY seq DESC LIMIT ? OFFSET ?",
+                (kind, -1 if limit is None else int(limit), int(offset)),
+            ).fetchall()
+        return [label for (label,) in rows]
+
+    # Memory accounting
+    def memory_usage(self) -> Dict[str, int]:
+        """Bytes stored per category, plus "total" counting shared arrays only once."""
+        self.ensure_loaded()
+        usage = {}
+        with self._lock:
+            for kind in ("matrix", "vector", "spl"):
+                row = self._conn.execute(
+                    "SELECT COALESCE(SUM(length(a.data)), 0) + COALESCE(SUM(length(b.data)), 0)"
+                    " + COALESCE(SUM(length(i.steps)), 0)"
+                    " FROM items i JOIN arrays a ON a.hash = i.a_hash LEFT JOIN arrays b ON b.hash = i.b_hash"
+                    " WHERE i.category = ?",
+                    (kind,),
+                ).fetchone()
+                usage[kind] = int(row[0])
+            row = self._conn.execute(
+                "SELECT (SELECT COALESCE(SUM(length(data)), 0) FROM arrays)"
+                " + (SELECT COALESCE(SUM(length(steps)), 0) FROM items)"
+            ).fetchone()
+            usage["total"] = int(row[0])
+        return usage
+
+    # Export utilities
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            kind: [HistoryManager._item_to_dict(kind, it, render_steps=True) for it in self._query(kind, 0, None)]
+            for kind in ("matrix", "vector", "spl")
+        }
+
+    def iter_export(self, kind: str, page: int = 200) -> Iterator[Dict[str, Any]]:
+        """Serialized items of one category, newest first, fetched a page at a time."""
+        offset = 0
+        while True:
+            items = self._query(kind, offset, page)
+            for it in items:
+                yield HistoryManager._item_to_dict(kind, it, render_steps=True)
+            if len(items) < page:
+                return
+            offset += page
+
+    def export_to_file(self, file_path: str, fmt: Optional[str] = None):
+        """Stream the history to `file_path` ("json", "compact" or "ndjson"; "*.gz" is gzipped)."""
+        write_history_stream(file_path, self.iter_export, fmt)
+
+    def import_from_file(self, file_path: str, replace: bool = False) -> int:
+        """Read an export item by item; imported entries rank below the current ones.
+
+        Everything happens in one transaction: an invalid file leaves the
+        database as it was.
+        """
+        self.ensure_loaded()
+        seen = dict.fromkeys(KINDS, 0)
+        with self._lock, self._conn:
+            if replace:
+                self._conn.execute("DELETE FROM items")
+                self._conn.execute("DELETE FROM arrays")
+            # exports are newest first: each item gets a seq just below the previous one
+            low = self._conn.execute("SELECT MIN(seq) FROM items").fetchone()[0]
+            seq = (1 if low is None else low) - 1
+            first = seq
+            for kind, item in read_history_stream(file_path):
+                if kind not in KINDS or not isinstance(item, dict):
+                    continue
+                if any(key.endswith(("_key", "_ref")) for key in item):
+                    # raised inside the transaction, so the DELETE above is rolled back too
+                    raise ValueError("File ini adalah snapshot penyimpanan, bukan hasil export history")
+                uid = item.get("id") or _derived_uid(kind, seen[kind], item)
+                seen[kind] += 1
+                if self._conn.execute("SELECT 1 FROM items WHERE uid = ?", (uid,)).fetchone():
+                    continue
+                if kind == "spl":
+                    A = np.array(item.get("A", []), dtype=float)
+                    b = np.array(item.get("b", []), dtype=float)
+                    if "ops" in item:
+                        steps = StepLog.from_compressed(A, b, item["ops"])
+                    else:
+                        steps = list(item.get("steps", []))
+                    self._insert_row(kind, item.get("label", "SPL"), A, b, item.get("method", ""),
+                                     steps, uid, seq=seq)
+                else:
+                    default = "Matriks" if kind == "matrix" else "Vektor"
+                    self._insert_row(kind, item.get("label", default), np.array(item.get("data", []), dtype=float),
+                                     uid=uid, seq=seq)
+                seq -= 1
+            if self.limit is not None:
+                for kind in KINDS:
+                    self._enforce_limit(kind)
+            # imported rows are the ones at or below `first` that the limit kept
+            count = self._conn.execute("SELECT COUNT(*) FROM items WHERE seq <= ?", (first,)).fetchone()[0]
+        return count
+
+    # Persistent storage helpers
+    def save_to_file(self, file_path: Optional[str] = None):
+        # the database is the storage; an explicit path writes a JSON copy
+        if file_path is not None and file_path != self.storage_path:
+            self.export_to_file(file_path)
+
+    def load_from_file(self, file_path: Optional[str] = None):
+        """Replace the database content with a JSON (or .npy index) history file."""
+        path = file_path or self.storage_path
+        source = HistoryManager(limit=self.limit or 10 ** 9, storage_path=path, lazy=True)
+        source.load_from_file(path)
+        self.ensure_loaded()
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM items")
+            self._conn.execute("DELETE FROM arrays")
+            for kind in ("matrix", "vector", "spl"):
+                # oldest first so that seq keeps the original order
+                for it in reversed(source._page(kind, 0, None)):
+                    if kind == "spl":
+                        self._insert_row(kind, it.label, it.A, it.b, it.method, it.steps, it.uid)
+                    else:
+                        self._insert_row(kind, it.label, it.data, uid=it.uid)
+
+    # Internals
+    def _store_array(self, arr: np.ndarray) -> str:
+        arr = np.ascontiguousarray(arr, dtype=float)
+        key = _content_key(arr)
+        self._conn.execute(
+            "INSERT OR IGNORE INTO arrays(hash, dtype, shape, data) VALUES (?, ?, ?, ?)",
+            (key, arr.dtype.str, json.dumps(list(arr.shape)), arr.tobytes()),
+        )
+        return key
+
+    def _insert_row(
+        self,
+        kind: str,
+        label: str,
+        a: np.ndarray,
+        b: Optional[np.ndarray] = None,
+        method: Optional[str] = None,
+        steps=None,
+        uid: Optional[str] = None,
+        seq: Optional[int] = None,
+    ):
+        a_hash = self._store_array(a)
+        b_hash = self._store_array(b) if b is not None else None
+        rows = int(a.shape[0]) if a.ndim >= 1 else None
+        cols = int(a.shape[1]) if a.ndim >= 2 else None
+        # rows placed below the newest ones (imports) also count as least recently used
+        now = time.time() if seq is None else 0.0
+        self._conn.execute(
+            "INSERT OR IGNORE INTO items(seq, uid, category, label, method, rows, cols, a_hash, b_hash, steps, created, last_used)"
+            " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (seq, uid or _new_uid(), kind, label, method, rows, cols, a_hash, b_hash,
+             self._steps_to_text(steps), now, now),
+        )
+
+    def _add(self, kind: str, label: str, a: np.ndarray, b: Optional[np.ndarray] = None,
+             method: Optional[str] = None, steps=None):
+        self.ensure_loaded()
+        with self._lock, self._conn:
+            if self._same_as_head(kind, label, a, b, method):
+                return
+            self._insert_row(kind, label, a, b, method, steps)
+            if self.limit is not None:
+                self._enforce_limit(kind)
+
+    def _enforce_limit(self, kind: str):
+        # drop the least recently used rows beyond the limit
+        stale = self._conn.execute(
+            "SELECT seq FROM items WHERE category = ? ORDER BY last_used DESC, seq DESC LIMIT -1 OFFSET ?",
+            (kind, self.limit),
+        ).fetchall()
+        for (seq,) in stale:
+            self._delete_seq(seq)
+
+    def _same_as_head(self, kind: str, label: str, a: np.ndarray, b: Optional[np.ndarray], method: Optional[str]) -> bool:
+        # repeating the last action on unchanged input does not create a new entry
+        row = self._conn.execute(
+            "SELECT label, method, a_hash, b_hash FROM items WHERE category = ? ORDER BY seq DESC LIMIT 1", (kind,)
+        ).fetchone()
+        if row is None:
+            return False
+        key_a = _content_key(np.ascontiguousarray(a, dtype=float))
+        key_b = _content_key(np.ascontiguousarray(b, dtype=float)) if b is not None else None
+        return row == (label, method, key_a, key_b)
+
+    def _seq_at(self, kind: str, idx: int) -> Optional[int]:
+        if idx < 0:
+            return None
+        row = self._conn.execute(
+            "SELECT seq FROM items WHERE category = ? ORDER BY seq DESC LIMIT 1 OFFSET ?", (kind, idx)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _delete_seq(self, seq: int):
+        row = self._conn.execute("SELECT a_hash, b_hash FROM items WHERE seq = ?", (seq,)).fetchone()
+        if row is None:
+            return
+        self._conn.execute("DELETE FROM items WHERE seq = ?", (seq,))
+        # arrays are shared by content hash; drop those no longer referenced
+        for key in {h for h in row if h is not None}:
+            used = self._conn.execute(
+                "SELECT 1 FROM items WHERE a_hash = ? UNION ALL SELECT 1 FROM items WHERE b_hash = ? LIMIT 1",
+                (key, key),
+            ).fetchone()
+            if used is None:
+                self._conn.execute("DELETE FROM arrays WHERE hash = ?", (key,))
+
+    def _remove(self, kind: str, idx: int) -> bool:
+        self.ensure_loaded()
+        with self._lock, self._conn:
+            seq = self._seq_at(kind, idx)
+            if seq is None:
+                return False
+            self._delete_seq(seq)
+            return True
+
+    def _touch(self, kind: str, idx: int):
+        self.ensure_loaded()
+        with self._lock, self._conn:
+            seq = self._seq_at(kind, idx)
+            if seq is not None:
+                self._conn.execute("UPDATE items SET last_used = ? WHERE seq = ?", (time.time(), seq))
+
+    @staticmethod
+    def _steps_to_text(steps) -> Optional[str]:
+        if steps is None:
+            return None
+        # step logs stay compressed; they are rendered when the entry is opened
+        if isinstance(steps, StepLog):
+            return json.dumps({"ops": steps.to_compressed()})
+        return json.dumps(list(steps), ensure_ascii=False)
+
+    @staticmethod
+    def _steps_from_text(A: np.ndarray, b: np.ndarray, text: Optional[str]):
+        if not text:
+            return []
+        data = json.loads(text)
+        if isinstance(data, dict):
+            return StepLog.from_compressed(A, b, data["ops"])
+        return data
+
+    def _load_array(self, key: str) -> np.ndarray:
+        dtype, shape, data = self._conn.execute(
+            "SELECT dtype, shape, data FROM arrays WHERE hash = ?", (key,)
+        ).fetchone()
+        return np.frombuffer(data, dtype=np.dtype(dtype)).reshape(json.loads(shape))
+
+    def _query(self, kind: str, offset: int, limit: Optional[int],
+               shape: Optional[Tuple[int, int]] = None, method: Optional[str] = None) -> list:
+        self.ensure_loaded()
+        sql = "SELECT uid, label, method, a_hash, b_hash, steps FROM items WHERE category = ?"
+        params: List[Any] = [kind]
+        if shape is not None:
+            sql += " AND rows = ? AND cols = ?"
+            params += [int(shape[0]), int(shape[1])]
+        if method is not None:
+            sql += " AND method = ?"
+            params.append(method)
+        sql += " ORDER BY seq DESC LIMIT ? OFFSET ?"
+        params += [-1 if limit is None else int(limit), int(offset)]
+        with self._lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            arrays: Dict[str, np.ndarray] = {}
+
+            def array(key: str) -> np.ndarray:
+                # rows sharing a payload also share the array object
+                if key not in arrays:
+                    arrays[key] = self._load_array(key)
+                return arrays[key]
+
+            items = []
+            for uid, label, meth, a_hash, b_hash, steps in rows:
+                if kind == "matrix":
+                    items.append(MatrixHistoryItem(array(a_hash), label, uid))
+                elif kind == "vector":
+                    items.append(VectorHistoryItem(array(a_hash), label, uid))
+                else:
+                    A, b = array(a_hash), array(b_hash)
+                    items.append(SPLHistoryItem(A, b, meth or "", label, self._steps_from_text(A, b, steps), uid))
+        return items
@@ -0,0 +1,133 @@
+from fractions import Fraction
+from math import lcm
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+
+def to_fraction(x) -> Fraction:
+    """Exact value of an input entry; floats are read as the decimal they print as (0.1 -> 1/10)."""
+    if isinstance(x, Fraction):
+        return x
+    if isinstance(x, (int, np.integer)):
+        return Fraction(int(x))
+    x = float(x)
+    if not np.isfinite(x):
+        raise ValueError("Mode eksak hanya untuk bilangan berhingga")
+    return Fraction(repr(x))
+
+
+def fmt_fraction(q: Fraction) -> str:
+    return str(q.numerator) if q.denominator == 1 else f"{q.numerator}/{q.denominator}"
+
+
+def _integer_rows(rows) -> Tuple[np.ndarray, List[int]]:
+    # scale every row by the lcm of its denominators; row scaling keeps rank
+    # and solutions, and divides out of the determinant
+    out, scales = [], []
+    for row in rows:
+        q = [to_fraction(v) for v in row]
+        s = lcm(*(v.denominator for v in q)) if q else 1
+        out.append([v.numerator * (s // v.denominator) for v in q])
+        scales.append(s)
+    M = np.empty((len(out), len(out[0]) if out else 0), dtype=object)
+    for i, row in enumerate(out):
+        M[i, :] = row
+    return M, scales
+
+
+def bareiss(M: np.ndarray, pivot_cols: Optional[int] = None):
+    """Fraction-free (Bareiss) elimination of an integer matrix, in place.
+
+    Every division is exact, and each entry stays a minor of the input, so
+    integers grow only linearly with n instead of exponentially as with plain
+    fractions. Pivots are searched in the first `pivot_cols` columns (all by
+    default). Returns (pivots, sign); for square nonsingular M the
+    determinant is sign * M[-1, -1].
+    """
+    m, ncols = M.shape
+    last = ncols if pivot_cols is None else pivot_cols
+    prev = 1
+    sign = 1
+    r = 0
+    pivots = []
+    for c in range(last):
+        if r >= m:
+            break
+        nz = np.flatnonzero(M[r:, c] != 0)
+        if nz.size == 0:
+            continue
+        p = r + int(nz[0])
+        if p != r:
+            M[[r, p]] = M[[p, r]]
+            sign = -sign
+        if r + 1 < m:
+            M[r + 1:, c + 1:] = (M[r, c] * M[r + 1:, c + 1:] - np.outer(M[r + 1:, c], M[r, c + 1:])) // prev
+            M[r + 1:, c] = 0
+        prev = M[r, c]
+        pivots.append(c)
+        r += 1
+    return pivots, sign
+
+
+def det_exact(A: np.ndarray) -> Fraction:
+    A = np.asarray(A)
+    n = A.shape[0]
+    if A.ndim != 2 or A.shape[1] != n:
+        raise ValueError("Determinan memerlukan matriks persegi (n x n)")
+    M, scales = _integer_rows(A)
+    pivots, sign = bareiss(M)
+    if len(pivots) < n:
+        return Fraction(0)
+    scale = 1
+    for s in scales:
+        scale *= s
+    return Fraction(sign * int(M[n - 1, n - 1]), scale)
+
+
+def rank_exact(A: np.ndarray) -> int:
+    M, _ = _integer_rows(np.atleast_2d(np.asarray(A)))
+    pivots, _ = bareiss(M)
+    return len(pivots)
+
+
+def solve_exact(A: np.ndarray, b: np.ndarray):
+    """Solve A x = b in exact rational arithmetic.
+
+    Returns (x, steps) where x is a list of Fractions, or None when the
+    system is inconsistent; with free variables the particular solution
+    (free variables 0) is returned, as in the float solvers.
+    """
+    A = np.asarray(A)
+    b = np.asarray(b).reshape(-1)
+    m, n = A.shape
+    if b.shape[0] != m:
+        raise ValueError("Jumlah baris b harus sama dengan jumlah baris A")
+    M, _ = _integer_rows(np.column_stack([A.astype(object), b.astype(object)]))
+    steps = ["Mode eksak: baris [A|b] diskalakan menjadi bilangan bulat, eliminasi Bareiss bebas pecahan"]
+    pivots, _ = bareiss(M, pivot_cols=n)
+    rank = len(pivots)
+    if n <= 20:
+        steps.append("Bentuk eselon (bilangan bulat):")
+        steps.append("\n".join("[ " + "\t".join(str(v) for v in row[:n]) + " | " + str(row[n]) + " ]" for row in M))
+    bad = [i for i in range(rank, m) if M[i, n] != 0]
+    if bad:
+        steps.append(f"Baris R{bad[0]+1} menjadi 0 = {M[bad[0], n]}: SPL tidak konsisten, tidak ada solusi")
+        return None, steps
+    # back substitution; the echelon entries are integers, so only n divisions per row
+    x = [Fraction(0)] * n
+    for i in range(rank - 1, -1, -1):
+        c = pivots[i]
+        acc = Fraction(int(M[i, n]))
+        for j in range(c + 1, n):
+            if M[i, j] != 0 and x[j] != 0:
+                acc -= int(M[i, j]) * x[j]
+        x[c] = acc / int(M[i, c])
+    pivot_set = set(pivots)
+    free = [c for c in range(n) if c not in pivot_set]
+    if free:
+        names = ", ".join(f"x{c+1}" for c in free)
+        steps.append(f"Rank {rank} < {n} variabel: tak hingga banyak solusi; variabel bebas {names} diambil 0")
+    steps.append("Solusi eksak:")
+    steps += [f"x{i+1} = {fmt_fraction(v)}" for i, v in enumerate(x)]
+    return x, steps
@@ -1,5 +1,9 @@
+from typing import List, Optional, Tuple
+
 import numpy as np
 
+from logic import exact_ops as eo
+
 
 def add(A: np.ndarray, B: np.ndarray) -> np.ndarray:
     if A.shape != B.shape:
@@ -19,36 +23,310 @@ def mul(A: np.ndarray, B: np.ndarray) -> np.ndarray:
     return A @ B
 
 
+def chain_plan(shapes: List[Tuple[int, int]]):
+    """Cheapest parenthesization of a matrix chain by dynamic programming, O(k^3).
+
+    Returns (split, cost) where split[i][j] is where the product of matrices
+    i..j is divided and cost is its number of scalar multiplications.
+    """
+    k = len(shapes)
+    for i in range(k - 1):
+        if shapes[i][1] != shapes[i + 1][0]:
+            raise ValueError(f"Kolom matriks ke-{i+1} harus sama dengan baris matriks ke-{i+2}: "
+                             f"{shapes[i]} x {shapes[i + 1]}")
+    dims = [shapes[0][0]] + [s[1] for s in shapes]
+    cost = [[0] * k for _ in range(k)]
+    split = [[0] * k for _ in range(k)]
+    for length in range(2, k + 1):
+        for i in range(k - length + 1):
+            j = i + length - 1
+            best = None
+            for s in range(i, j):
+                c = cost[i][s] + cost[s + 1][j] + dims[i] * dims[s + 1] * dims[j + 1]
+                if best is None or c < best:
+                    best, split[i][j] = c, s
+            cost[i][j] = best
+    return split, cost[0][k - 1] if k else 0
+
+
+def mul_chain(mats: List[np.ndarray], names: Optional[List[str]] = None):
+    """Multiply mats[0] @ mats[1] @ ... in the cheapest order.
+
+    Returns (result, info) with the chosen order and the estimated flops
+    (2 per scalar multiply-add) next to plain left-to-right multiplication.
+    """
+    if not mats:
+        raise ValueError("Tidak ada matriks untuk dikalikan")
+    names = names or [chr(ord("A") + i) for i in range(len(mats))]
+    split, cost = chain_plan([m.shape for m in mats])
+
+    naive = 0
+    rows = mats[0].shape[0]
+    for m in mats[1:]:
+        naive += rows * m.shape[0] * m.shape[1]
+
+    def run(i, j):
+        if i == j:
+            return mats[i], names[i]
+        s = split[i][j]
+        left, ltxt = run(i, s)
+        right, rtxt = run(s + 1, j)
+        return left @ right, f"({ltxt} {rtxt})" if (i, j) != (0, len(mats) - 1) else f"{ltxt} {rtxt}"
+
+    res, order = run(0, len(mats) - 1)
+    return res, {"urutan": order, "flop_optimal": 2 * cost, "flop_naif": 2 * naive}
+
+
 def transpose(A: np.ndarray) -> np.ndarray:
     return A.T
 
 
-def analyze(A: np.ndarray) -> dict:
+# np.allclose defaults, so the flags match what analyze reported before
+_RTOL = 1e-5
+_ATOL = 1e-8
+
+
+def _close(a: np.ndarray, b) -> bool:
+    return bool(np.all(np.isclose(a, b, rtol=_RTOL, atol=_ATOL)))
+
+
+def _small(a: np.ndarray) -> bool:
+    return _close(a, 0.0)
+
+
+def _kept(a: np.ndarray) -> bool:
+    # entries a check keeps as they are must still equal themselves (NaN does not)
+    return not np.isnan(a).any()
+
+
+def classify_structure(A: np.ndarray, block: int = 256) -> dict:
+    """Zero/diagonal/identity/symmetric/skew/triangular flags in one blocked pass.
+
+    Block (I, J) above the diagonal is read together with its mirror (J, I),
+    so every entry is visited about once and temporaries are block-sized.
+    A flag is no longer checked once it is disproved, and the scan stops as
+    soon as none is left. Tolerances are those of np.allclose.
+    """
+    A = np.asarray(A)
+    r, c = A.shape
+    flags = {"nol": True}
+    if r == c:
+        flags.update(diagonal=True, identitas=True, simetris=True, skew_simetris=True,
+                     segitiga_atas=True, segitiga_bawah=True)
+    else:
+        for i in range(0, r, block):
+            if not _small(A[i:i + block]):
+                flags["nol"] = False
+                break
+        flags.update(diagonal=False, identitas=False, simetris=False, skew_simetris=False,
+                     segitiga_atas=False, segitiga_bawah=False)
+        return flags
+
+    live = set(flags)
+    for i in range(0, r, block):
+        for j in range(i, r, block):
+            if not live:
+                return flags
+            up = A[i:i + block, j:j + block]   # above (or on) the diagonal
+            lo = A[j:j + block, i:i + block]   # its mirror below
+            if i == j:
+                d = np.diagonal(up)
+                off_up = up[np.triu_indices_from(up, 1)]
+                off_lo = up[np.tril_indices_from(up, -1)]
+                checks = {
+                    "nol": lambda: _small(up),
+                    "diagonal": lambda: _kept(d) and _small(off_up) and _small(off_lo),
+                    "identitas": lambda: _small(off_up) and _small(off_lo) and _close(d, 1.0),
+                    "simetris": lambda: _close(up, up.T),
+                    "skew_simetris": lambda: _close(up, -up.T),
+                    "segitiga_atas": lambda: _kept(d) and _kept(off_up) and _small(off_lo),
+                    "segitiga_bawah": lambda: _kept(d) and _kept(off_lo) and _small(off_up),
+                }
+            else:
+                checks = {
+                    "nol": lambda: _small(up) and _small(lo),
+                    "diagonal": lambda: _small(up) and _small(lo),
+                    "identitas": lambda: _small(up) and _small(lo),
+                    # allclose(A, A.T) compares both ways round, each with its own rtol term
+                    "simetris": lambda: _close(up, lo.T) and _close(lo, up.T),
+                    "skew_simetris": lambda: _close(up, -lo.T) and _close(lo, -up.T),
+                    "segitiga_atas": lambda: _kept(up) and _small(lo),
+                    "segitiga_bawah": lambda: _kept(lo) and _small(up),
+                }
+            for key in list(live):
+                if not checks[key]():
+                    flags[key] = False
+                    live.discard(key)
+    return flags
+
+
+def pivoted_qr(A: np.ndarray):
+    """Householder QR with column pivoting, A P = Q R (rank-revealing).
+
+    Only R is formed. Returns (R, perm, sign) where sign = det(Q) * sign(P),
+    so for square A, det(A) = sign * prod(diag(R)). |R[k, k]| is
+    non-increasing, which is what makes the rank readable from it.
+    """
+    R = np.array(A, dtype=float)
+    m, n = R.shape
+    perm = np.arange(n)
+    sign = 1.0
+    for k in range(min(m, n)):
+        norms = np.einsum("ij,ij->j", R[k:, k:], R[k:, k:])
+        j = k + int(np.argmax(norms))
+        if j != k:
+            R[:, [k, j]] = R[:, [j, k]]
+            perm[[k, j]] = perm[[j, k]]
+            sign = -sign
+        x = R[k:, k]
+        alpha = float(np.linalg.norm(x))
+        if alpha == 0.0:
+            break  # every remaining column is zero
+        v = x.copy()
+        v[0] += alpha if x[0] >= 0 else -alpha
+        v /= np.linalg.norm(v)
+        R[k:, k:] -= 2.0 * np.outer(v, v @ R[k:, k:])
+        sign = -sign  # each Householder reflector has determinant -1
+    return np.triu(R), perm, sign
+
+
+def hager_inverse_norm1(solve, solve_transposed, n: int, iters: int = 5) -> float:
+    """Hager's estimate of ||A^{-1}||_1 from solves with A and A^T.
+
+    `solve(b)` and `solve_transposed(b)` return A^{-1} b and A^{-T} b; a few
+    of each replace forming the inverse, so the cost is that of the solves.
+    """
+    x = np.full(n, 1.0 / n)
+    est = 0.0
+    for _ in range(iters):
+        y = solve(x)
+        est = float(np.abs(y).sum())
+        z = solve_transposed(np.where(y >= 0, 1.0, -1.0))
+        j = int(np.argmax(np.abs(z)))
+        if abs(z[j]) <= z @ x:
+            break
+        x = np.zeros(n)
+        x[j] = 1.0
+    return est
+
+
+def _triangular_cond1(R: np.ndarray) -> float:
+    """Hager's estimate of ||R||_1 ||R^{-1}||_1 for upper-triangular R, O(n^2)."""
+    n = R.shape[0]
+    d = np.diagonal(R)
+
+    def solve(b, trans):
+        x = np.array(b, dtype=float)
+        if trans:   # R^T is lower triangular
+            for i in range(n):
+                x[i] = (x[i] - R[:i, i] @ x[:i]) / d[i]
+        else:
+            for i in range(n - 1, -1, -1):
+                x[i] = (x[i] - R[i, i + 1:] @ x[i + 1:]) / d[i]
+        return x
+
+    est = hager_inverse_norm1(lambda b: solve(b, False), lambda b: solve(b, True), n)
+    return float(np.abs(R).sum(axis=0).max()) * est
+
+
+def factor_summary(A: np.ndarray, method: str = "qr") -> dict:
+    """Rank, sign/log|det|, singularity and condition number from one factorization.
+
+    method "qr" (fast) runs LAPACK's blocked Householder QR on square A. When
+    a diagonal entry of R is small enough to hint at rank deficiency, the rank
+    is settled by the column-pivoted QR above instead; that second pass only
+    happens for (nearly) singular matrices. The condition number is then a
+    1-norm estimate of cond(R). Non-square A only needs its rank, which the
+    singular values give in a single LAPACK call.
+    method "svd" uses the singular values (exact rank and 2-norm condition
+    number) without forming U and V. They fix |det| but not its sign, so this
+    mode reports log|det| and |det| only ("determinan_mutlak"), not
+    "tanda_det"/"determinan"; getting the sign would take a second O(n^3) pass.
+    The factorization actually used is reported under "faktorisasi". With NaN
+    or inf entries nothing is factorized and every number is NaN.
+    """
+    A = np.asarray(A, dtype=float)
+    r, c = A.shape
+    eps = np.finfo(float).eps
+    if method not in ("qr", "svd"):
+        raise ValueError(f"Metode faktorisasi tidak dikenal: {method} (pilih: qr, svd)")
+    if not np.isfinite(A).all():
+        nan = float("nan")
+        out = {"faktorisasi": None, "rank": None}
+        if r == c:
+            if method == "svd":
+                out.update(log_abs_det=nan, determinan_mutlak=nan)
+            else:
+                out.update(tanda_det=nan, log_abs_det=nan, determinan=nan)
+            out.update(singular=None, kondisi=nan)
+        return out
+    if method == "svd" or r != c:
+        used = "SVD"
+        d = np.linalg.svd(A, compute_uv=False)
+        top = float(d[0]) if d.size else 0.0
+        sign = None
+    else:
+        used = "QR"
+        h, tau = np.linalg.qr(A, mode="raw")
+        R = np.triu(h.T[:c])
+        sign = -1.0 if np.count_nonzero(tau) % 2 else 1.0  # each reflector has det -1
+        d = np.abs(np.diagonal(R))
+        top = float(d.max()) if d.size else 0.0
+        if not d.size or d.min() <= np.sqrt(eps) * top:
+            used = "QR berpivot"
+            R, _, sign = pivoted_qr(A)
+            d = np.abs(np.diagonal(R))
+            top = float(d[0]) if d.size else 0.0
+        sign *= float(np.prod(np.sign(np.diagonal(R))))
+    tol = max(r, c) * eps * top
+    rank = int(np.count_nonzero(d > tol))
+    out = {"faktorisasi": used, "rank": rank}
+    if r == c:
+        singular = rank < c
+        with np.errstate(divide="ignore"):
+            logabs = float(np.sum(np.log(d)))
+        if sign is not None:
+            out["tanda_det"] = 0.0 if singular else sign
+        out["log_abs_det"] = float("-inf") if singular else logabs
+        # exp may overflow/underflow for large n; log_abs_det stays exact
+        with np.errstate(over="ignore", under="ignore"):
+            absdet = 0.0 if singular else float(np.exp(logabs))
+        if sign is None:
+            out["determinan_mutlak"] = absdet
+        else:
+            out["determinan"] = 0.0 if singular else sign * absdet
+        out["singular"] = singular
+        if singular:
+            out["kondisi"] = float("inf")
+        elif used == "SVD":
+            out["kondisi"] = top / float(d.min())
+        else:
+            out["kondisi"] = _triangular_cond1(R)
+    return out
+
+
+def analyze(A: np.ndarray, exact: bool = False, method: str = "qr") -> dict:
     info = {}
     r, c = A.shape
     info["ukuran"] = f"{r} x {c}"
     info["persegi"] = (r == c)
-    info["nol"] = np.allclose(A, 0)
-    info["diagonal"] = bool(r == c and np.allclose(A, np.diag(np.diag(A))))
-    info["identitas"] = bool(r == c and np.allclose(A, np.eye(r)))
-    info["simetris"] = bool(r == c and np.allclose(A, A.T))
-    info["skew_simetris"] = bool(r == c and np.allclose(A, -A.T))
-    info["segitiga_atas"] = bool(r == c and np.allclose(A, np.triu(A)))
-    info["segitiga_bawah"] = bool(r == c and np.allclose(A, np.tril(A)))
+    info.update(classify_structure(A))
+    # one shared factorization gives rank, determinant, singularity and condition;
+    # factor_summary reports which one it used
     try:
-        info["rank"] = int(np.linalg.matrix_rank(A))
-    except Exception:
+        info.update(factor_summary(A, method))
+    except np.linalg.LinAlgError:
         info["rank"] = None
     if r == c:
-        try:
-            det = float(np.linalg.det(A))
-            info["determinan"] = det
-            info["singular"] = bool(abs(det) < 1e-10)
-        except Exception:
-            info["determinan"] = None
-            info["singular"] = None
         try:
             info["jejak_trace"] = float(np.trace(A))
         except Exception:
             info["jejak_trace"] = None
+    if exact:
+        # rank and determinant in rational arithmetic (Bareiss), no rounding
+        info["rank"] = eo.rank_exact(A)
+        if r == c:
+            det = eo.det_exact(A)
+            info["determinan_eksak"] = eo.fmt_fraction(det)
+            info["singular"] = det == 0
     return info
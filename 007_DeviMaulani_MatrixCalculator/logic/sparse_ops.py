@@ -0,0 +1,82 @@
+from typing import Tuple, Union
+
+import numpy as np
+
+
+class CSRMatrix:
+    """Sparse matrix in compressed sparse row form.
+
+    Row i holds the values data[indptr[i]:indptr[i+1]] in the columns
+    indices[indptr[i]:indptr[i+1]]. Memory is O(nnz) instead of O(n^2),
+    and a matrix-vector product costs O(nnz).
+    """
+
+    def __init__(self, data: np.ndarray, indices: np.ndarray, indptr: np.ndarray, shape: Tuple[int, int]):
+        self.data = np.asarray(data, dtype=float)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.shape = (int(shape[0]), int(shape[1]))
+        if self.indptr.shape[0] != self.shape[0] + 1 or self.data.shape != self.indices.shape:
+            raise ValueError("Struktur CSR tidak valid")
+        # row number of every stored value, used by the vectorized products
+        self._rows = np.repeat(np.arange(self.shape[0]), np.diff(self.indptr))
+
+    @classmethod
+    def from_dense(cls, A: np.ndarray, tol: float = 0.0) -> "CSRMatrix":
+        A = np.asarray(A, dtype=float)
+        if A.ndim != 2:
+            raise ValueError("Matriks harus 2 dimensi")
+        rows, cols = np.nonzero(np.abs(A) > tol)
+        return cls.from_coo(rows, cols, A[rows, cols], A.shape)
+
+    @classmethod
+    def from_coo(cls, rows, cols, vals, shape: Tuple[int, int]) -> "CSRMatrix":
+        """Build from (row, col, value) triplets; duplicates are summed."""
+        rows = np.asarray(rows, dtype=np.int64)
+        cols = np.asarray(cols, dtype=np.int64)
+        vals = np.asarray(vals, dtype=float)
+        m, n = int(shape[0]), int(shape[1])
+        if rows.size and (rows.min() < 0 or rows.max() >= m or cols.min() < 0 or cols.max() >= n):
+            raise ValueError("Indeks di luar ukuran matriks")
+        order = np.lexsort((cols, rows))
+        rows, cols, vals = rows[order], cols[order], vals[order]
+        if rows.size:
+            first = np.ones(rows.size, dtype=bool)
+            first[1:] = (rows[1:] != rows[:-1]) | (cols[1:] != cols[:-1])
+            starts = np.flatnonzero(first)
+            vals = np.add.reduceat(vals, starts)
+            rows, cols = rows[starts], cols[starts]
+        indptr = np.zeros(m + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=m), out=indptr[1:])
+        return cls(vals, cols, indptr, (m, n))
+
+    @property
+    def nnz(self) -> int:
+        return int(self.data.size)
+
+    def matvec(self, x: np.ndarray) -> np.ndarray:
+        x = np.asarray(x, dtype=float)
+        if x.shape[0] != self.shape[1]:
+            raise ValueError(f"Dimensi vektor harus {self.shape[1]}")
+        return np.bincount(self._rows, weights=self.data * x[self.indices], minlength=self.shape[0])
+
+    def __matmul__(self, x: np.ndarray) -> np.ndarray:
+        return self.matvec(x)
+
+    def diagonal(self) -> np.ndarray:
+        d = np.zeros(min(self.shape))
+        on = self._rows == self.indices
+        np.add.at(d, self._rows[on], self.data[on])
+        return d
+
+    def transpose(self) -> "CSRMatrix":
+        return CSRMatrix.from_coo(self.indices, self._rows, self.data, (self.shape[1], self.shape[0]))
+
+    def to_dense(self) -> np.ndarray:
+        A = np.zeros(self.shape)
+        np.add.at(A, (self._rows, self.indices), self.data)
+        return A
+
+
+def as_csr(A: Union[np.ndarray, CSRMatrix]) -> CSRMatrix:
+    return A if isinstance(A, CSRMatrix) else CSRMatrix.from_dense(A)
@@ -1,5 +1,15 @@
+import base64
+import hashlib
+import json
+import os
+import tempfile
+import zlib
+from typing import Callable, Iterator, List, Optional, Union
 import numpy as np
 
+from logic.matrix_ops import hager_inverse_norm1
+from logic.sparse_ops import CSRMatrix, as_csr
+
 
 def _fmt_matrix(A: np.ndarray) -> str:
     rows = ["[ " + "\t".join(f"{x:8.4g}" for x in row) + " ]" for row in A]
@@ -10,111 +20,619 @@ def _fmt_vector(b: np.ndarray) -> str:
     return "[ " + ", ".join(f"{x:.6g}" for x in b.ravel()) + " ]"
 
 
+def _as_columns(b: np.ndarray) -> np.ndarray:
+    # right-hand side(s) as an (n, k) array; a plain vector becomes one column
+    b = np.array(b, dtype=float)
+    return b.reshape(-1, 1) if b.ndim < 2 else b
+
+
 def _fmt_aug(A: np.ndarray, b: np.ndarray) -> str:
     A = np.atleast_2d(A.astype(float))
-    b = np.atleast_2d(b.astype(float)).reshape(-1, 1)
+    b = _as_columns(b)
     parts = []
     for i in range(A.shape[0]):
         left = "\t".join(f"{x:8.4g}" for x in A[i])
-        parts.append(f"[ {left} | {b[i,0]:8.4g} ]")
+        if b.shape[1] == 0:
+            parts.append(f"[ {left} ]")
+        else:
+            right = "\t".join(f"{x:8.4g}" for x in b[i])
+            parts.append(f"[ {left} | {right} ]")
     return "\n".join(parts)
 
 
-def gaussian_elimination(A: np.ndarray, b: np.ndarray):
+# Step recording levels for the row-reduction solvers:
+#   full    - every swap/scale/row update, each followed by the current [A|b]
+#   summary - swaps and scales, one line per eliminated column, no matrices
+#   none    - only the result
+STEP_LEVELS = ("full", "summary", "none")
+# above these sizes a requested level is downgraded automatically
+STEPS_FULL_MAX_N = 20
+STEPS_SUMMARY_MAX_N = 200
+
+
+def _check_step_mode(steps: str):
+    if steps not in STEP_LEVELS:
+        raise ValueError(f"Mode langkah tidak dikenal: {steps} (pilih: {', '.join(STEP_LEVELS)})")
+
+
+def _step_level(steps: str, n: int) -> str:
+    _check_step_mode(steps)
+    if steps == "full" and n > STEPS_FULL_MAX_N:
+        steps = "summary"
+    if steps == "summary" and n > STEPS_SUMMARY_MAX_N:
+        steps = "none"
+    return steps
+
+
+class StepLog:
+    """Steps of a row-reduction kept as a structured operation log.
+
+    Only the operations are recorded (swap, scale, row update, plus plain text
+    and result lines); the text with every intermediate [A|b] is produced on
+    first read by replaying the operations from the initial system. The log
+    iterates like the list of step strings it replaces, and `to_compressed`
+    gives a compact representation for storage.
+
+    `level` (see STEP_LEVELS) decides which operations are recorded at all.
+    """
+
+    def __init__(self, A: np.ndarray, b: np.ndarray, ops: Optional[list] = None, level: str = "full"):
+        self.A0 = np.array(A, dtype=float)
+        self.b0 = _as_columns(b)
+        self.ops: list = ops if ops is not None else []
+        self.level = level
+        self._lines: Optional[List[str]] = None
+
+    # Recording
+    def text(self, line: str):
+        self._record(["t", line])
+
+    def show(self):
+        if self.level == "full":
+            self._record(["a"])
+
+    def swap(self, i: int, j: int):
+        if self.level != "none":
+            self._record(["s", int(i), int(j)])
+
+    def scale(self, i: int, value: float):
+        if self.level != "none":
+            self._record(["k", int(i), float(value)])
+
+    def update(self, r: int, src: int, factor: float, col: Optional[int] = None):
+        if self.level == "full":
+            op = ["u", int(r), int(src), float(factor)]
+            self._record(op if col is None else op + [int(col)])
+
+    def eliminated(self, col: int, src: int, count: int):
+        # summary of one column's row updates; the full level lists them one by one
+        if self.level == "summary" and count:
+            self._record(["e", int(col), int(src), int(count)])
+
+    def vector(self, x: np.ndarray):
+        self._record(["v", np.asarray(x, dtype=float).ravel().tolist()])
+
+    def append(self, line: str):
+        self.text(line)
+
+    def _record(self, op: list):
+        self.ops.append(op)
+        self._lines = None
+
+    # Rendering
+    def lines(self) -> List[str]:
+        if self._lines is None:
+            self._lines = self._render()
+        return self._lines
+
+    def detached(self) -> "StepLog":
+        """The same log without the rendered text, for keeping it around cheaply."""
+        return StepLog(self.A0, self.b0, list(self.ops), self.level)
+
+    def _render(self) -> List[str]:
+        A = self.A0.copy()
+        b = self.b0.copy()
+        out = []
+        for op in self.ops:
+            kind = op[0]
+            if kind == "t":
+                out.append(op[1])
+            elif kind == "a":
+                out.append(_fmt_aug(A, b))
+            elif kind == "s":
+                i, j = op[1], op[2]
+                A[[i, j]] = A[[j, i]]
+                b[[i, j]] = b[[j, i]]
+                out.append(f"Tukar baris R{i+1} <-> R{j+1}")
+            elif kind == "k":
+                i, v = op[1], op[2]
+                A[i] = A[i] / v
+                b[i] = b[i] / v
+                out.append(f"Skalakan R{i+1} = R{i+1} / {v:.6g}")
+            elif kind == "u":
+                r, src, f = op[1], op[2], op[3]
+                A[r] = A[r] - f * A[src]
+                b[r] = b[r] - f * b[src]
+                if len(op) > 4:
+                    # unscaled pivot (LU): the eliminated entry is exactly zero
+                    A[r, op[4]] = 0.0
+                out.append(f"R{r+1} = R{r+1} - ({f:.6g})*R{src+1}")
+            elif kind == "e":
+                col, src, count = op[1], op[2], op[3]
+                out.append(f"Kolom {col}: {count} baris dieliminasi dengan R{src+1}")
+            elif kind == "v":
+                out.append(_fmt_vector(np.array(op[1], dtype=float)))
+        return out
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.lines())
+
+    def __len__(self) -> int:
+        return len(self.lines())
+
+    def __getitem__(self, idx):
+        return self.lines()[idx]
+
+    def __add__(self, other):
+        return self.lines() + list(other)
+
+    def __radd__(self, other):
+        return list(other) + self.lines()
+
+    @property
+    def nbytes(self) -> int:
+        # rough size of the recorded operations, without rendering them
+        return sum(len(op[1]) if op[0] == "t" else 16 * len(op) for op in self.ops)
+
+    # Storage
+    def to_compressed(self) -> str:
+        raw = json.dumps(self.ops, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        return base64.b64encode(zlib.compress(raw, 6)).decode("ascii")
+
+    @classmethod
+    def from_compressed(cls, A: np.ndarray, b: np.ndarray, data: str) -> "StepLog":
+        ops = json.loads(zlib.decompress(base64.b64decode(data)).decode("utf-8"))
+        return cls(A, b, ops)
+
+
+def _fingerprint(A: np.ndarray) -> str:
+    # content hash standing in for a kept copy of A
+    A = np.ascontiguousarray(A, dtype=float)
+    h = hashlib.sha1(str(A.shape).encode("ascii"))
+    h.update(A.data)
+    return h.hexdigest()
+
+
+def _level_note(requested: str, level: str, m: int, n: int) -> str:
+    return f"Sistem {m}x{n}: mode langkah '{requested}' diturunkan ke '{level}'"
+
+
+def _step_header(log: StepLog, requested: str, m: int, n: int, title: str = "Matriks awal [A|b]:"):
+    if log.level != requested:
+        log.text(_level_note(requested, log.level, m, n))
+    if log.level == "full":
+        log.text(title)
+        log.show()
+
+
+def _elimination_tol(A: np.ndarray) -> float:
+    # entries at or below this are roundoff; relative to A, so scaling A does not change the verdict
+    return max(A.shape) * np.finfo(float).eps * float(np.abs(A).max(initial=0.0))
+
+
+def _eliminate(A: np.ndarray, b: np.ndarray, row: int, col: int, start: int, log: StepLog):
+    """Clear column `col` in rows start.. (except the pivot row) with one rank-1 update.
+
+    The pivot row must already be scaled to 1 in `col`. Rows whose entry is
+    roundoff next to the rest of that row are left untouched. The test is per
+    row because rows already scaled to a leading 1 (above the pivot in
+    Gauss–Jordan) need not share the scale of A.
+    """
+    factors = A[start:, col].copy()
+    if start <= row:
+        factors[row - start] = 0.0
+    rowmax = np.abs(A[start:]).max(axis=1, initial=0.0)
+    factors[np.abs(factors) <= max(A.shape) * np.finfo(float).eps * rowmax] = 0.0
+    hit = np.flatnonzero(factors)
+    if hit.size:
+        # only the rows that change, and only from the pivot row's first nonzero column
+        lo, hi = start + hit[0], start + hit[-1] + 1
+        lead = int(np.flatnonzero(A[row])[0])
+        f = factors[hit[0]:hit[-1] + 1]
+        A[lo:hi, lead:] -= np.outer(f, A[row, lead:])
+        b[lo:hi] -= f[:, None] * b[row]
+    if log.level == "full":
+        # the replay applies these one row at a time and gets the same numbers
+        for i in hit:
+            log.update(start + i, row, factors[i])
+            log.show()
+    log.eliminated(col, row, hit.size)
+
+
+def _read_solution(A: np.ndarray, b: np.ndarray, pivots: List[int], log: StepLog,
+                   lstsq: bool, reduced: bool, amax: float, bmax: float) -> Optional[np.ndarray]:
+    """Solution of the row-reduced system [A|b] with pivot columns `pivots`.
+
+    A row of zeros in A with a nonzero right side means no solution; fewer
+    pivots than unknowns means infinitely many, and the particular solution
+    with all free variables 0 is returned. `lstsq` asks for the least-squares
+    (minimum-norm) solution in those two cases instead. `amax`/`bmax` are
+    max|A| and max|b| of the original system.
+    """
+    m, n = A.shape
+    rank = len(pivots)
+    bv = b[:, 0]
+    # a leftover right side is roundoff unless it exceeds what cancelling
+    # b against (A-sized factor) x (pivot row of b) can leave behind
+    carried = amax * float(np.abs(bv[:rank]).max(initial=0.0))
+    thr = 10 * max(m, n) * np.finfo(float).eps * (bmax + carried)
+    inconsistent = bool(np.any(np.abs(bv[rank:]) > thr))
+    pivot_set = set(pivots)
+    free = [c for c in range(n) if c not in pivot_set]
+    if lstsq and (inconsistent or free):
+        x, *_ = np.linalg.lstsq(A, bv, rcond=None)
+        log.text("Solusi least squares (norma minimum):")
+        log.vector(x)
+        return x
+    if inconsistent:
+        r = rank + int(np.argmax(np.abs(bv[rank:]) > thr))
+        log.text(f"Baris R{r+1} menjadi 0 = {bv[r]:.6g}: SPL tidak konsisten, tidak ada solusi")
+        return None
+    x = np.zeros(n)
+    if reduced:
+        # RREF: each pivot row reads off its variable directly
+        for i, c in enumerate(pivots):
+            x[c] = bv[i] / A[i, c]
+        log.text("Solusi dibaca dari bentuk eselon baris tereduksi:")
+    else:
+        for i in range(rank - 1, -1, -1):
+            c = pivots[i]
+            x[c] = (bv[i] - A[i, c + 1:] @ x[c + 1:]) / A[i, c]
+        log.text("Substitusi mundur:")
+    if free:
+        names = ", ".join(f"x{c+1}" for c in free)
+        log.text(f"Rank {rank} < {n} variabel: tak hingga banyak solusi; variabel bebas {names} diambil 0")
+    log.vector(x)
+    return x
+
+
+def gaussian_elimination(A: np.ndarray, b: np.ndarray, steps: str = "full", lstsq: bool = False):
     A = A.astype(float).copy()
     b = b.astype(float).copy().reshape(-1, 1)
     m, n = A.shape
-    steps = ["Matriks awal [A|b]:", _fmt_aug(A, b)]
+    log = StepLog(A, b, level=_step_level(steps, max(m, n)))
+    _step_header(log, steps, m, n)
+    tol = _elimination_tol(A)
+    amax, bmax = float(np.abs(A).max(initial=0.0)), float(np.abs(b).max(initial=0.0))
 
     # Forward elimination
     row = 0
+    pivots = []
     for col in range(n):
         if row >= m:
             break
         # pivot: find max abs in column from row..m-1
         pivot = row + np.argmax(np.abs(A[row:, col]))
-        if abs(A[pivot, col]) < 1e-12:
-            steps.append(f"Kolom {col} tidak memiliki pivot (semua ~0)")
+        if abs(A[pivot, col]) <= tol:
+            log.text(f"Kolom {col} tidak memiliki pivot (semua ~0)")
             continue
         if pivot != row:
             A[[row, pivot]] = A[[pivot, row]]
             b[[row, pivot]] = b[[pivot, row]]
-            steps.append(f"Tukar baris R{row+1} <-> R{pivot+1}")
-            steps.append(_fmt_aug(A, b))
+            log.swap(row, pivot)
+            log.show()
         # Normalize pivot row to 1 (optional for Gauss, helpful for steps)
         piv_val = A[row, col]
         if abs(piv_val - 1.0) > 1e-12:
             A[row] = A[row] / piv_val
             b[row] = b[row] / piv_val
-            steps.append(f"Skalakan R{row+1} = R{row+1} / {piv_val:.6g}")
-            steps.append(_fmt_aug(A, b))
+            log.scale(row, piv_val)
+            log.show()
         # Eliminate rows below
-        for r in range(row + 1, m):
-            factor = A[r, col]
-            if abs(factor) < 1e-12:
-                continue
-            A[r] = A[r] - factor * A[row]
-            b[r] = b[r] - factor * b[row]
-            steps.append(f"R{r+1} = R{r+1} - ({factor:.6g})*R{row+1}")
-            steps.append(_fmt_aug(A, b))
+        _eliminate(A, b, row, col, row + 1, log)
+        pivots.append(col)
         row += 1
-    try:
-        x, *_ = np.linalg.lstsq(A, b, rcond=None)
-        x = x.reshape(-1)
-        steps.append("Solusi (least squares jika tidak persegi):")
-        steps.append(_fmt_vector(x))
-        return x, steps
-    except Exception as e:
-        steps.append(f"Gagal menyelesaikan: {e}")
-        raise
+    return _read_solution(A, b, pivots, log, lstsq, reduced=False, amax=amax, bmax=bmax), log
 
 
-def gauss_jordan(A: np.ndarray, b: np.ndarray):
+def gauss_jordan(A: np.ndarray, b: np.ndarray, steps: str = "full", lstsq: bool = False):
     A = A.astype(float).copy()
     b = b.astype(float).copy().reshape(-1, 1)
     m, n = A.shape
-    steps = ["Matriks awal [A|b]:", _fmt_aug(A, b)]
+    log = StepLog(A, b, level=_step_level(steps, max(m, n)))
+    _step_header(log, steps, m, n)
+    tol = _elimination_tol(A)
+    amax, bmax = float(np.abs(A).max(initial=0.0)), float(np.abs(b).max(initial=0.0))
 
     row = 0
+    pivots = []
     for col in range(n):
         if row >= m:
             break
         pivot = row + np.argmax(np.abs(A[row:, col]))
-        if abs(A[pivot, col]) < 1e-12:
+        if abs(A[pivot, col]) <= tol:
             continue
         if pivot != row:
             A[[row, pivot]] = A[[pivot, row]]
             b[[row, pivot]] = b[[pivot, row]]
-            steps.append(f"Tukar baris R{row+1} <-> R{pivot+1}")
-            steps.append(_fmt_aug(A, b))
+            log.swap(row, pivot)
+            log.show()
         piv_val = A[row, col]
         if abs(piv_val - 1.0) > 1e-12:
             A[row] = A[row] / piv_val
             b[row] = b[row] / piv_val
-            steps.append(f"Skalakan R{row+1} = R{row+1} / {piv_val:.6g}")
-            steps.append(_fmt_aug(A, b))
+            log.scale(row, piv_val)
+            log.show()
         # eliminate above and below
-        for r in range(m):
-            if r == row:
-                continue
-            factor = A[r, col]
-            if abs(factor) < 1e-12:
-                continue
-            A[r] = A[r] - factor * A[row]
-            b[r] = b[r] - factor * b[row]
-            steps.append(f"R{r+1} = R{r+1} - ({factor:.6g})*R{row+1}")
-            steps.append(_fmt_aug(A, b))
+        _eliminate(A, b, row, col, 0, log)
+        pivots.append(col)
         row += 1
 
-    try:
-        x, *_ = np.linalg.lstsq(A, b, rcond=None)
-        x = x.reshape(-1)
-        steps.append("Solusi (jika tak tunggal, solusi LS):")
-        steps.append(_fmt_vector(x))
-        return x, steps
-    except Exception as e:
-        steps.append(f"Gagal menyelesaikan: {e}")
-        raise
+    return _read_solution(A, b, pivots, log, lstsq, reduced=True, amax=amax, bmax=bmax), log
+
+
+class LUFactorization:
+    """PA = LU with partial pivoting, factored once and reused for many right-hand sides.
+
+    L (unit lower) and U are kept together in `lu`, the row order in `perm`.
+    `steps` is the StepLog of the elimination (row swaps and row updates on A);
+    replaying it next to a right-hand side B carries out the forward
+    substitution on B as well. Each `solve` then costs O(n^2) per column.
+    `dtype` is the precision of the factors (float32 for mixed precision);
+    solutions are always returned as float64.
+    """
+
+    def __init__(self, A: np.ndarray, steps: str = "full", dtype=np.float64):
+        A = np.asarray(A, dtype=float)
+        n = A.shape[0]
+        if A.ndim != 2 or A.shape[1] != n:
+            raise ValueError("Dekomposisi LU memerlukan matriks persegi (n x n)")
+        # A itself is not kept: only what matches() and cond_estimate() need
+        self.shape = A.shape
+        self.fingerprint = _fingerprint(A)
+        self.norm1 = float(np.abs(A).sum(axis=0).max(initial=0.0))
+        self.requested = steps
+        self.lu = A.astype(dtype)
+        self.perm = np.arange(n)
+        self.sign = 1.0
+        self.singular = False
+        level = _step_level(steps, n)
+        # without steps the log holds text only, so it needs no copy of A to replay
+        log = StepLog(A if level != "none" else np.zeros((n, 0)), np.zeros((n, 0)), level=level)
+        _step_header(log, steps, n, n, title="Matriks awal:")
+        self._factor(log)
+        self.steps = log
+
+    def _factor(self, log: StepLog):
+        lu, n = self.lu, self.lu.shape[0]
+        # pivots are compared with the scale of A, so scaling A does not change the verdict
+        tol = n * np.finfo(lu.dtype).eps * (np.abs(lu).max() if lu.size else 0.0)
+        for k in range(n):
+            p = k + int(np.argmax(np.abs(lu[k:, k])))
+            if abs(lu[p, k]) <= tol:
+                self.singular = True
+                log.text(f"Kolom {k} tidak memiliki pivot (semua ~0)")
+                continue
+            if p != k:
+                lu[[k, p]] = lu[[p, k]]
+                self.perm[[k, p]] = self.perm[[p, k]]
+                self.sign = -self.sign
+                log.swap(k, p)
+                log.show()
+            # multipliers are stored in place of the entries they eliminate
+            f = lu[k + 1:, k] / lu[k, k]
+            lu[k + 1:, k] = f
+            lu[k + 1:, k + 1:] -= np.outer(f, lu[k, k + 1:])
+            hit = np.flatnonzero(np.abs(f) >= 1e-12)
+            if log.level == "full":
+                for i in hit:
+                    log.update(k + 1 + i, k, f[i], col=k)
+                    log.show()
+            log.eliminated(k, k, hit.size)
+        if log.level != "none":
+            log.text("Urutan baris P: " + ", ".join(f"R{i+1}" for i in self.perm))
+        if log.level == "full":
+            log.text("L =")
+            log.text(_fmt_matrix(self.L))
+            log.text("U =")
+            log.text(_fmt_matrix(self.U))
+
+    @property
+    def L(self) -> np.ndarray:
+        return np.tril(self.lu, -1) + np.eye(self.lu.shape[0])
+
+    @property
+    def U(self) -> np.ndarray:
+        return np.triu(self.lu)
+
+    def matches(self, A: np.ndarray, steps: Optional[str] = None) -> bool:
+        """True if this factorization belongs to `A` (and was recorded at `steps`)."""
+        A = np.asarray(A, dtype=float)
+        if steps is not None and steps != self.requested:
+            return False
+        return A.shape == self.shape and _fingerprint(A) == self.fingerprint
+
+    def det(self) -> float:
+        return float(self.sign * np.prod(np.diag(self.lu)))
+
+    def solve(self, B: np.ndarray) -> np.ndarray:
+        """Solve A X = B; `B` may be a vector or an (n, k) matrix of columns."""
+        if self.singular:
+            raise ValueError("Matriks A singular, faktorisasi LU tidak dapat menyelesaikan SPL")
+        B = np.asarray(B, dtype=float)
+        n = self.lu.shape[0]
+        if B.shape[0] != n:
+            raise ValueError("Jumlah baris b harus sama dengan jumlah baris A")
+        lu = self.lu
+        Y = _as_columns(B)[self.perm].astype(lu.dtype)
+        # Ly = Pb (L has a unit diagonal), then Ux = y
+        for i in range(1, n):
+            Y[i] -= lu[i, :i] @ Y[:i]
+        for i in range(n - 1, -1, -1):
+            Y[i] = (Y[i] - lu[i, i + 1:] @ Y[i + 1:]) / lu[i, i]
+        Y = Y.astype(float)
+        return Y.reshape(-1) if B.ndim < 2 else Y
+
+    def solve_transposed(self, c: np.ndarray) -> np.ndarray:
+        """Solve A^T y = c for a vector c (A^T = U^T L^T P)."""
+        lu, n = self.lu, self.lu.shape[0]
+        z = np.array(c, dtype=lu.dtype)
+        for i in range(n):
+            z[i] = (z[i] - lu[:i, i] @ z[:i]) / lu[i, i]
+        for i in range(n - 2, -1, -1):
+            z[i] -= lu[i + 1:, i] @ z[i + 1:]
+        y = np.empty(n)
+        y[self.perm] = z  # back to float64
+        return y
+
+    def cond_estimate(self, iters: int = 5) -> float:
+        """Estimate of the 1-norm condition number ||A||_1 ||A^{-1}||_1.
+
+        Hager's method: a few O(n^2) solves with A and A^T instead of the
+        inverse or an SVD. Returns inf when A is singular.
+        """
+        if self.singular:
+            return float("inf")
+        est = hager_inverse_norm1(self.solve, self.solve_transposed, self.lu.shape[0], iters)
+        return self.norm1 * est
+
+
+def mixed_precision_solve(A: np.ndarray, b: np.ndarray, max_sweeps: int = 10, steps: str = "full"):
+    """Factor A in float32, then refine x with float64 residuals.
+
+    The O(n^3) factorization runs on half-size data; each refinement sweep
+    (r = b - A x in float64, solve with the float32 factors, x += d) costs
+    O(n^2). When the correction stops shrinking, or A is too ill-conditioned
+    for float32, the system is re-solved with a float64 LU instead.
+    """
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float).reshape(-1)
+    n = A.shape[0]
+    if A.ndim != 2 or A.shape[1] != n:
+        raise ValueError("Presisi campuran memerlukan A persegi (n x n)")
+    if b.shape[0] != n:
+        raise ValueError("Jumlah baris b harus sama dengan jumlah baris A")
+    _check_step_mode(steps)
+    eps = np.finfo(float).eps
+    normA = float(np.abs(A).sum(axis=1).max())
+    lines = ["Faktorisasi LU dalam float32, perbaikan iteratif dengan residu float64"]
+    factor = LUFactorization(A, steps="none", dtype=np.float32)
+    converged = False
+    sweeps = 0
+    x = np.zeros(n)
+    if not factor.singular:
+        x = factor.solve(b)
+        prev = np.inf
+        for sweeps in range(1, max_sweeps + 1):
+            r = b - A @ x
+            # normwise backward error; n * eps means x is as good as a float64 solve
+            err = float(np.abs(r).max()) / (normA * float(np.abs(x).max()) + float(np.abs(b).max()) or 1.0)
+            if steps == "full":
+                lines.append(f"Sweep {sweeps}: ||r||_inf = {np.abs(r).max():.3e}, galat mundur = {err:.3e}")
+            if err <= n * eps:
+                converged = True
+                break
+            d = factor.solve(r)
+            size = float(np.abs(d).max())
+            if not np.isfinite(size) or size > 0.5 * prev:
+                break
+            prev = size
+            x = x + d
+    if converged:
+        lines.append(f"Konvergen setelah {sweeps} sweep perbaikan")
+    else:
+        lines.append("Perbaikan iteratif tidak konvergen; beralih ke faktorisasi float64")
+        factor = LUFactorization(A, steps="none")
+        if factor.singular:
+            raise ValueError("Matriks A singular, tidak ada solusi unik")
+        x = factor.solve(b)
+    lines.append(f"Norma residu akhir ||b - Ax||_2 = {np.linalg.norm(b - A @ x):.3e}")
+    if steps != "none":
+        lines.append("Solusi:")
+        lines.append(_fmt_vector(x))
+    return x, lines
+
+
+def lu_decomposition(A: np.ndarray, B: np.ndarray, steps: str = "full",
+                     factor: Optional[LUFactorization] = None):
+    """Solve A X = B by LU; `factor` is reused when it already belongs to `A`.
+
+    Returns (X, steps, factor) so the caller can keep the factorization.
+    """
+    A = np.asarray(A, dtype=float)
+    B = np.asarray(B, dtype=float)
+    reused = factor is not None and factor.matches(A, steps)
+    if not reused:
+        factor = LUFactorization(A, steps=steps)
+    X = factor.solve(B)
+    if reused:
+        log = StepLog(A, B, level=factor.steps.level)
+        log.text("Faktorisasi LU untuk A ini dipakai ulang; hanya substitusi yang dihitung.")
+    else:
+        # replaying the elimination next to B carries out Ly = Pb
+        log = StepLog(A, B, ops=list(factor.steps.ops), level=factor.steps.level)
+    log.text("Substitusi maju Ly = Pb dan mundur Ux = y:")
+    X2 = _as_columns(X)
+    for j in range(X2.shape[1]):
+        if X2.shape[1] > 1:
+            log.text(f"Kolom b{j+1}:")
+        log.vector(X2[:, j])
+    return X, log, factor
+
+
+def solve_batch(A: np.ndarray, b: np.ndarray, tol: Optional[float] = None):
+    """Solve k systems A[i] x = b[i] at once; A is (k, n, n), b is (k, n).
+
+    Gaussian elimination with partial pivoting runs over the whole stack, so
+    the Python loop is over the n columns only and no steps are recorded.
+    A bad system does not stop the others: it is flagged in `singular`, its
+    row of X is NaN and its residual is inf. A pivot counts as zero at or below
+    `tol`, by default n * eps * max|A[i]| for each system separately.
+
+    Returns (X, singular, residual) with residual = ||A x - b||_2 per system.
+    """
+    A0 = np.asarray(A, dtype=float)
+    b0 = np.asarray(b, dtype=float)
+    if A0.ndim != 3 or A0.shape[1] != A0.shape[2]:
+        raise ValueError("A harus berbentuk (k, n, n)")
+    k, n, _ = A0.shape
+    if b0.shape != (k, n):
+        raise ValueError(f"b harus berbentuk ({k}, {n})")
+    A = A0.copy()
+    b = b0.copy()
+    idx = np.arange(k)
+    singular = np.zeros(k, dtype=bool)
+    if tol is None:
+        tol = n * np.finfo(float).eps * np.abs(A0).max(axis=(1, 2), initial=0.0)
+
+    for col in range(n):
+        # pivot rows, one per system
+        piv = col + np.argmax(np.abs(A[:, col:, col]), axis=1)
+        swap = piv != col
+        if swap.any():
+            s, p = idx[swap], piv[swap]
+            A[s, col], A[s, p] = A[s, p], A[s, col].copy()
+            b[s, col], b[s, p] = b[s, p], b[s, col].copy()
+        d = A[:, col, col]
+        bad = np.abs(d) <= tol
+        singular |= bad
+        d = np.where(bad, 1.0, d)
+        f = A[:, col + 1:, col] / d[:, None]
+        f[bad] = 0.0
+        A[:, col + 1:, col:] -= f[:, :, None] * A[:, None, col, col:]
+        b[:, col + 1:] -= f * b[:, col, None]
+
+    # back substitution on the upper-triangular stack
+    diag = np.diagonal(A, axis1=1, axis2=2).copy()
+    diag[singular] = 1.0
+    X = np.zeros((k, n))
+    for i in range(n - 1, -1, -1):
+        X[:, i] = (b[:, i] - np.einsum("kj,kj->k", A[:, i, i + 1:], X[:, i + 1:])) / diag[:, i]
+    X[singular] = np.nan
+
+    residual = np.linalg.norm(np.einsum("kij,kj->ki", A0, X) - b0, axis=1)
+    residual[singular] = np.inf
+    return X, singular, residual
 
 
 def cramer(A: np.ndarray, b: np.ndarray):
@@ -123,39 +641,558 @@ def cramer(A: np.ndarray, b: np.ndarray):
     n = A.shape[1]
     if A.shape[0] != n:
         raise ValueError("Aturan Cramer memerlukan matriks persegi (n x n)")
-    detA = float(np.linalg.det(A))
+    # One LU of A gives everything: A_i differs from A only in column i, so
+    # det(A_i) = det(A) * x_i with x = A^{-1} b (the O(n^2) LU solve).
+    factor = LUFactorization(A, steps="none")
+    detA = factor.det()
     steps = [f"det(A) = {detA:.6g}"]
-    if abs(detA) < 1e-12:
+    # singularity comes from the pivots relative to the size of A; det(A) itself
+    # scales as s^n and says nothing about solvability (1e-4 * I has det 1e-16)
+    if factor.singular:
         steps.append("det(A)=0, tidak ada solusi unik")
         return None, steps
-    x = np.zeros(n)
+    x = factor.solve(b)
     for i in range(n):
-        Ai = A.copy()
-        Ai[:, i] = b
-        detAi = float(np.linalg.det(Ai))
-        xi = detAi / detA
-        x[i] = xi
+        xi = float(x[i])
+        detAi = detA * xi
         steps.append(f"det(A_{i+1}) = {detAi:.6g} -> x{i+1} = det(A_{i+1})/det(A) = {xi:.6g}")
     steps.append("Solusi:")
     steps.append(_fmt_vector(x))
     return x, steps
 
 
-def inverse_method(A: np.ndarray, b: np.ndarray):
+# condition numbers above this are reported as ill-conditioned
+COND_WARN = 1e8
+
+
+def inverse_method(A: np.ndarray, b: np.ndarray, steps: str = "full"):
     A = A.astype(float)
     b = b.astype(float).reshape(-1)
-    if A.shape[0] != A.shape[1]:
+    n = A.shape[0]
+    if A.shape[1] != n:
         raise ValueError("Metode invers memerlukan A persegi (n x n)")
-    detA = float(np.linalg.det(A))
-    if abs(detA) < 1e-12:
+    level = _step_level(steps, n)
+    # one LU gives det(A), x and, only when it is shown, A^{-1}
+    factor = LUFactorization(A, steps="none")
+    # singularity is judged from the estimated condition number (inf for a
+    # vanished pivot), not from det(A), which under- or overflows for badly scaled matrices
+    cond = factor.cond_estimate()
+    if cond * np.finfo(float).eps >= 1.0:
         raise ValueError("Matriks A singular, tidak memiliki invers")
-    Ainv = np.linalg.inv(A)
-    x = Ainv @ b
-    steps = [
+    detA = factor.det()
+    x = factor.solve(b)
+    lines = [_level_note(steps, level, n, n)] if level != steps else []
+    lines += [
         f"det(A) = {detA:.6g}",
-        "A^{-1}:",
-        _fmt_matrix(Ainv),
-        "x = A^{-1} b:",
-        _fmt_vector(x),
+        f"Perkiraan bilangan kondisi (norma-1): {cond:.3g}",
+    ]
+    if cond > COND_WARN:
+        lines.append("Peringatan: A berkondisi buruk, solusi bisa tidak akurat")
+    if level == "full":
+        lines += ["A^{-1}:", _fmt_matrix(factor.solve(np.eye(n)))]
+    lines += ["x = A^{-1} b:", _fmt_vector(x)]
+    return x, lines
+
+
+# ---------------------------------------------------------------------------
+# Structure-aware solving: cheap paths for diagonal, triangular and banded A
+
+
+STRUCTURE_NAMES = {
+    "diagonal": "diagonal",
+    "lower": "segitiga bawah",
+    "upper": "segitiga atas",
+    "tridiagonal": "tridiagonal",
+    "banded": "berpita",
+    "dense": "padat",
+}
+
+
+def detect_structure(A: np.ndarray, tol: float = 0.0):
+    """Classify square A by its nonzero pattern.
+
+    Returns (kind, lower, upper) where lower/upper are the bandwidths below
+    and above the diagonal and kind is a key of STRUCTURE_NAMES. A band is
+    only worth using while it is narrow, so wide bands count as dense.
+    """
+    A = np.asarray(A)
+    n = A.shape[0]
+    rows, cols = np.nonzero(np.abs(A) > tol)
+    lower = int((rows - cols).max(initial=0))
+    upper = int((cols - rows).max(initial=0))
+    if lower == 0 and upper == 0:
+        kind = "diagonal"
+    elif upper == 0:
+        kind = "lower"
+    elif lower == 0:
+        kind = "upper"
+    elif lower == 1 and upper == 1:
+        kind = "tridiagonal"
+    elif 2 * (lower + upper) < n:
+        kind = "banded"
+    else:
+        kind = "dense"
+    return kind, lower, upper
+
+
+def _singular_error():
+    return ValueError("Matriks A singular, tidak ada solusi unik")
+
+
+def _check_pivot(v, scale: float):
+    # v may be one pivot or a whole diagonal; scale comes from _elimination_tol
+    if np.any(np.abs(v) <= scale):
+        raise _singular_error()
+
+
+def _solve_triangular(A: np.ndarray, b: np.ndarray, lower: bool) -> np.ndarray:
+    # forward (lower) or back (upper) substitution, O(n^2)
+    n = A.shape[0]
+    d = np.diag(A)
+    _check_pivot(d, _elimination_tol(A))
+    x = np.zeros(n)
+    order = range(n) if lower else range(n - 1, -1, -1)
+    for i in order:
+        s = A[i, :i] @ x[:i] if lower else A[i, i + 1:] @ x[i + 1:]
+        x[i] = (b[i] - s) / d[i]
+    return x
+
+
+def _solve_thomas(A: np.ndarray, b: np.ndarray):
+    """Thomas algorithm, O(n); returns None when a pivot vanishes (needs pivoting)."""
+    n = A.shape[0]
+    sub = np.diag(A, -1)
+    diag = np.diag(A).astype(float)
+    sup = np.diag(A, 1)
+    c = np.zeros(max(n - 1, 0))
+    d = np.zeros(n)
+    tiny = _elimination_tol(A)
+    den = diag[0]
+    if abs(den) <= tiny:
+        return None
+    if n > 1:
+        c[0] = sup[0] / den
+    d[0] = b[0] / den
+    for i in range(1, n):
+        den = diag[i] - sub[i - 1] * c[i - 1]
+        if abs(den) <= tiny:
+            return None
+        if i < n - 1:
+            c[i] = sup[i] / den
+        d[i] = (b[i] - sub[i - 1] * d[i - 1]) / den
+    x = d
+    for i in range(n - 2, -1, -1):
+        x[i] -= c[i] * x[i + 1]
+    return x
+
+
+def _solve_banded(A: np.ndarray, b: np.ndarray, lower: int, upper: int) -> np.ndarray:
+    """Gaussian elimination with partial pivoting restricted to the band.
+
+    Row swaps widen the upper band to at most lower + upper, so each pivot
+    touches a (lower x (lower + upper + 1)) block: O(n * lower * (lower + upper)).
+    """
+    A = A.astype(float).copy()
+    b = b.astype(float).copy()
+    n = A.shape[0]
+    tiny = _elimination_tol(A)
+    width = lower + upper
+    for k in range(n):
+        last = min(n, k + lower + 1)
+        p = k + int(np.argmax(np.abs(A[k:last, k])))
+        _check_pivot(A[p, k], tiny)
+        if p != k:
+            A[[k, p]] = A[[p, k]]
+            b[[k, p]] = b[[p, k]]
+        end = min(n, k + width + 1)
+        f = A[k + 1:last, k] / A[k, k]
+        A[k + 1:last, k:end] -= np.outer(f, A[k, k:end])
+        b[k + 1:last] -= f * b[k]
+    x = np.zeros(n)
+    for i in range(n - 1, -1, -1):
+        end = min(n, i + width + 1)
+        x[i] = (b[i] - A[i, i + 1:end] @ x[i + 1:end]) / A[i, i]
+    return x
+
+
+def solve_structured(A: np.ndarray, b: np.ndarray, steps: str = "full"):
+    """Detect the structure of A and solve with the cheapest fitting method.
+
+    diagonal O(n), triangular O(n^2) substitution, tridiagonal Thomas O(n)
+    (banded LU when it would need pivoting), banded LU O(n * bandwidth^2);
+    anything else goes to the dense LU. The steps say which path was taken.
+    """
+    A = np.asarray(A, dtype=float)
+    b = np.asarray(b, dtype=float).reshape(-1)
+    n = A.shape[0]
+    if A.shape[1] != n:
+        raise ValueError("Penyelesaian otomatis memerlukan A persegi (n x n)")
+    if b.shape[0] != n:
+        raise ValueError("Jumlah baris b harus sama dengan jumlah baris A")
+    kind, lower, upper = detect_structure(A)
+    lines = [f"Struktur terdeteksi: {STRUCTURE_NAMES[kind]} (lebar pita bawah {lower}, atas {upper})"]
+    if kind == "dense":
+        x, log, _ = lu_decomposition(A, b, steps=steps)
+        head = [["t", line] for line in lines + ["Jalur: dekomposisi LU (padat), O(n^3)"]]
+        return x, StepLog(A, b, ops=head + log.ops, level=log.level)
+    if kind == "diagonal":
+        d = np.diag(A)
+        _check_pivot(d, _elimination_tol(A))
+        x = b / d
+        lines.append("Jalur: pembagian per diagonal x_i = b_i / a_ii, O(n)")
+    elif kind in ("lower", "upper"):
+        x = _solve_triangular(A, b, lower=(kind == "lower"))
+        name = "substitusi maju" if kind == "lower" else "substitusi mundur"
+        lines.append(f"Jalur: {name}, O(n^2)")
+    else:
+        x = _solve_thomas(A, b) if kind == "tridiagonal" else None
+        if x is not None:
+            lines.append("Jalur: algoritma Thomas, O(n)")
+        else:
+            if kind == "tridiagonal":
+                lines.append("Algoritma Thomas memerlukan pivot; beralih ke LU berpita")
+            x = _solve_banded(A, b, lower, upper)
+            lines.append(f"Jalur: LU berpita dengan pivot parsial, O(n * {lower} * {lower + upper})")
+    if steps != "none":
+        lines.append("Solusi:")
+        lines.append(_fmt_vector(x))
+    return x, lines
+
+
+# ---------------------------------------------------------------------------
+# Iterative solvers on CSR matrices (memory O(nnz), one matvec per iteration)
+
+
+class _Convergence:
+    """Residual history of an iterative solver, written as step lines.
+
+    full records every iteration, summary about twenty of them, none only the
+    outcome. Unlike the elimination steps these lines are cheap, so the level
+    is not lowered for large n.
+    """
+
+    def __init__(self, title: str, A: CSRMatrix, steps: str, maxiter: int, precond: bool):
+        _check_step_mode(steps)
+        self.level = steps
+        self.every = 1 if steps == "full" else max(1, maxiter // 20)
+        self.lines = [
+            f"{title}: n = {A.shape[0]}, nnz = {A.nnz}"
+            + (", prekondisi Jacobi" if precond else ""),
+        ]
+        if steps != "none":
+            self.lines.append("Riwayat konvergensi (||r|| / ||b||):")
+
+    def record(self, k: int, rel: float):
+        if self.level != "none" and (k % self.every == 0 or k <= 3):
+            self.lines.append(f"Iterasi {k}: {rel:.3e}")
+
+    def finish(self, k: int, rel: float, tol: float, x: np.ndarray, diverged: bool = False) -> List[str]:
+        if diverged:
+            self.lines.append(f"Divergen pada iterasi {k} (residu relatif {rel:.3e}): metode ini tidak "
+                              "konvergen untuk A ini, tidak ada solusi; gunakan metode langsung")
+            return self.lines
+        if rel <= tol:
+            self.lines.append(f"Konvergen setelah {k} iterasi (residu relatif {rel:.3e} <= {tol:.1e})")
+        else:
+            self.lines.append(f"Tidak konvergen setelah {k} iterasi (residu relatif {rel:.3e} > {tol:.1e})")
+        self.lines.append("Solusi:")
+        self.lines.append(_fmt_vector(x[:50]) + (f" ... ({x.shape[0]} komponen)" if x.shape[0] > 50 else ""))
+        return self.lines
+
+
+def _iterative_setup(A, b, x0, maxiter):
+    A = as_csr(A)
+    n = A.shape[0]
+    if A.shape[1] != n:
+        raise ValueError("Metode iteratif memerlukan A persegi (n x n)")
+    b = np.asarray(b, dtype=float).reshape(-1)
+    if b.shape[0] != n:
+        raise ValueError("Jumlah baris b harus sama dengan jumlah baris A")
+    x = np.zeros(n) if x0 is None else np.array(x0, dtype=float).reshape(-1)
+    bnorm = float(np.linalg.norm(b)) or 1.0
+    return A, b, x, bnorm, (maxiter if maxiter is not None else max(100, 10 * n))
+
+
+# a stationary iteration whose residual grew this far above its best is diverging
+DIVERGENCE_GROWTH = 1e4
+
+
+def _diverging(rel: float, best: float) -> bool:
+    return not np.isfinite(rel) or rel > DIVERGENCE_GROWTH * best
+
+
+def _nonzero_diagonal(A: CSRMatrix) -> np.ndarray:
+    d = A.diagonal()
+    if np.any(d == 0):
+        raise ValueError("Diagonal A memuat nol; tukar baris A atau gunakan metode lain")
+    return d
+
+
+def conjugate_gradient(A, b: np.ndarray, tol: float = 1e-10, maxiter: Optional[int] = None,
+                       precondition: bool = True, x0: Optional[np.ndarray] = None, steps: str = "summary"):
+    """Preconditioned conjugate gradient; A must be symmetric positive definite."""
+    A, b, x, bnorm, maxiter = _iterative_setup(A, b, x0, maxiter)
+    log = _Convergence("Gradien Konjugat (CG)", A, steps, maxiter, precondition)
+    Minv = 1.0 / _nonzero_diagonal(A) if precondition else None
+    r = b - A @ x
+    z = Minv * r if precondition else r
+    p = z.copy()
+    rz = float(r @ z)
+    rel = float(np.linalg.norm(r)) / bnorm
+    k = 0
+    log.record(k, rel)
+    while rel > tol and k < maxiter:
+        Ap = A @ p
+        pAp = float(p @ Ap)
+        if pAp <= 0:
+            raise ValueError("A tidak definit positif; CG memerlukan A simetris definit positif")
+        alpha = rz / pAp
+        x += alpha * p
+        r -= alpha * Ap
+        z = Minv * r if precondition else r
+        rz_new = float(r @ z)
+        p = z + (rz_new / rz) * p
+        rz = rz_new
+        k += 1
+        rel = float(np.linalg.norm(r)) / bnorm
+        log.record(k, rel)
+    return x, log.finish(k, rel, tol, x)
+
+
+def gmres(A, b: np.ndarray, tol: float = 1e-10, maxiter: Optional[int] = None, restart: int = 30,
+          precondition: bool = True, x0: Optional[np.ndarray] = None, steps: str = "summary"):
+    """Restarted GMRES(restart) with optional right Jacobi preconditioning; any nonsingular A."""
+    A, b, x, bnorm, maxiter = _iterative_setup(A, b, x0, maxiter)
+    log = _Convergence(f"GMRES({restart})", A, steps, maxiter, precondition)
+    Minv = 1.0 / _nonzero_diagonal(A) if precondition else np.ones(A.shape[0])
+    n = A.shape[0]
+    m = max(1, min(restart, n))
+    r = b - A @ x
+    rel = float(np.linalg.norm(r)) / bnorm
+    k = 0
+    log.record(k, rel)
+    while rel > tol and k < maxiter:
+        beta = float(np.linalg.norm(r))
+        V = np.zeros((m + 1, n))
+        H = np.zeros((m + 1, m))
+        cs, sn = np.zeros(m), np.zeros(m)
+        g = np.zeros(m + 1)
+        g[0] = beta
+        V[0] = r / beta
+        j = 0
+        while j < m and k < maxiter:
+            # Arnoldi step on A M^{-1} (modified Gram-Schmidt)
+            w = A @ (Minv * V[j])
+            for i in range(j + 1):
+                H[i, j] = w @ V[i]
+                w -= H[i, j] * V[i]
+            H[j + 1, j] = np.linalg.norm(w)
+            breakdown = H[j + 1, j] == 0  # the Krylov space is exhausted: the solution is exact
+            if not breakdown:
+                V[j + 1] = w / H[j + 1, j]
+            # Givens rotations keep the least-squares problem triangular
+            for i in range(j):
+                H[i, j], H[i + 1, j] = cs[i] * H[i, j] + sn[i] * H[i + 1, j], -sn[i] * H[i, j] + cs[i] * H[i + 1, j]
+            h = np.hypot(H[j, j], H[j + 1, j])
+            cs[j], sn[j] = (H[j, j] / h, H[j + 1, j] / h) if h > 0 else (1.0, 0.0)
+            H[j, j], H[j + 1, j] = cs[j] * H[j, j] + sn[j] * H[j + 1, j], 0.0
+            g[j + 1] = -sn[j] * g[j]
+            g[j] = cs[j] * g[j]
+            j += 1
+            k += 1
+            rel = abs(g[j]) / bnorm
+            log.record(k, rel)
+            if rel <= tol or breakdown:
+                break
+        y = np.zeros(j)
+        for i in range(j - 1, -1, -1):
+            y[i] = (g[i] - H[i, i + 1:j] @ y[i + 1:]) / H[i, i]
+        x += Minv * (V[:j].T @ y)
+        r = b - A @ x
+        rel = float(np.linalg.norm(r)) / bnorm
+    return x, log.finish(k, rel, tol, x)
+
+
+def jacobi(A, b: np.ndarray, tol: float = 1e-10, maxiter: Optional[int] = None,
+           x0: Optional[np.ndarray] = None, steps: str = "summary"):
+    """Jacobi iteration x <- x + D^{-1}(b - A x); converges for diagonally dominant A.
+
+    Returns (None, steps) when the residual blows up (see DIVERGENCE_GROWTH).
+    """
+    A, b, x, bnorm, maxiter = _iterative_setup(A, b, x0, maxiter)
+    log = _Convergence("Iterasi Jacobi", A, steps, maxiter, False)
+    d = _nonzero_diagonal(A)
+    r = b - A @ x
+    rel = best = float(np.linalg.norm(r)) / bnorm
+    k = 0
+    log.record(k, rel)
+    diverged = False
+    with np.errstate(over="ignore", invalid="ignore"):
+        while rel > tol and k < maxiter:
+            x += r / d
+            r = b - A @ x
+            k += 1
+            rel = float(np.linalg.norm(r)) / bnorm
+            log.record(k, rel)
+            if _diverging(rel, best):
+                diverged = True
+                break
+            best = min(best, rel)
+    return (None if diverged else x), log.finish(k, rel, tol, x, diverged)
+
+
+def gauss_seidel(A, b: np.ndarray, tol: float = 1e-10, maxiter: Optional[int] = None,
+                 x0: Optional[np.ndarray] = None, steps: str = "summary"):
+    """Gauss–Seidel sweeps over the CSR rows; each row uses the newest values.
+
+    Returns (None, steps) when the residual blows up (see DIVERGENCE_GROWTH).
+    """
+    A, b, x, bnorm, maxiter = _iterative_setup(A, b, x0, maxiter)
+    log = _Convergence("Gauss–Seidel", A, steps, maxiter, False)
+    d = _nonzero_diagonal(A)
+    data, indices, indptr = A.data, A.indices, A.indptr
+    r = b - A @ x
+    rel = best = float(np.linalg.norm(r)) / bnorm
+    k = 0
+    log.record(k, rel)
+    diverged = False
+    with np.errstate(over="ignore", invalid="ignore"):
+        while rel > tol and k < maxiter:
+            for i in range(A.shape[0]):
+                lo, hi = indptr[i], indptr[i + 1]
+                x[i] += (b[i] - data[lo:hi] @ x[indices[lo:hi]]) / d[i]
+            r = b - A @ x
+            k += 1
+            rel = float(np.linalg.norm(r)) / bnorm
+            log.record(k, rel)
+            if _diverging(rel, best):
+                diverged = True
+                break
+            best = min(best, rel)
+    return (None if diverged else x), log.finish(k, rel, tol, x, diverged)
+
+
+# ---------------------------------------------------------------------------
+# Out-of-core blocked LU: A lives in a .npy file and is never fully in RAM
+
+
+def _open_npy(src):
+    if isinstance(src, (str, os.PathLike)):
+        return np.load(src, mmap_mode="r")
+    return np.asarray(src) if not isinstance(src, np.memmap) else src
+
+
+def blocked_lu_solve(A: Union[str, np.ndarray], b: Union[str, np.ndarray], block: int = 256,
+                     scratch: Optional[str] = None, keep_scratch: bool = False,
+                     progress: Optional[Callable[[float, str], None]] = None):
+    """Solve A x = b for a dense A stored in a .npy file larger than memory.
+
+    A (a path or a memmap) is read in row blocks and copied to a memory-mapped
+    float64 scratch .npy, which is factored in place into PA = LU, one panel
+    of `block` columns at a time (right-looking blocked LU with partial
+    pivoting). Only a panel, a block row of U and one trailing block are held
+    in RAM, about 3 * n * block floats, so n is bounded by disk space.
+    `progress(fraction, message)` is called after every panel and solve pass.
+
+    Returns (x, steps). The scratch file (default: next to A) is removed unless
+    `keep_scratch` is set; it then holds the LU factors.
+    """
+    src = _open_npy(A)
+    n = src.shape[0]
+    if src.ndim != 2 or src.shape[1] != n:
+        raise ValueError("LU berblok memerlukan A persegi (n x n)")
+    rhs = np.array(_open_npy(b), dtype=float).reshape(-1)
+    if rhs.shape[0] != n:
+        raise ValueError("Jumlah baris b harus sama dengan jumlah baris A")
+    nb = max(1, min(int(block), n))
+    report = progress or (lambda frac, msg: None)
+
+    if scratch is None:
+        where = os.path.dirname(os.path.abspath(A)) if isinstance(A, (str, os.PathLike)) else None
+        fd, scratch = tempfile.mkstemp(suffix=".npy", prefix="lu_", dir=where)
+        os.close(fd)
+    LU = np.lib.format.open_memmap(scratch, mode="w+", dtype=np.float64, shape=(n, n))
+    try:
+        amax = 0.0
+        for r0 in range(0, n, nb):
+            chunk = np.asarray(src[r0:r0 + nb], dtype=float)
+            amax = max(amax, float(np.abs(chunk).max(initial=0.0)))
+            LU[r0:r0 + nb] = chunk
+        report(0.0, "A disalin ke berkas sementara")
+        tol = n * np.finfo(float).eps * amax
+        perm = np.arange(n)
+
+        for k0 in range(0, n, nb):
+            k1 = min(n, k0 + nb)
+            # factor the panel LU[k0:, k0:k1] in memory
+            P = np.array(LU[k0:, k0:k1])
+            swaps = []
+            for j in range(k1 - k0):
+                p = j + int(np.argmax(np.abs(P[j:, j])))
+                if abs(P[p, j]) <= tol:
+                    raise ValueError("Matriks A singular, tidak ada solusi unik")
+                if p != j:
+                    P[[j, p]] = P[[p, j]]
+                    swaps.append((k0 + j, k0 + p))
+                P[j + 1:, j] /= P[j, j]
+                P[j + 1:, j + 1:] -= np.outer(P[j + 1:, j], P[j, j + 1:])
+            LU[k0:, k0:k1] = P
+            # the same row swaps on the columns outside the panel
+            for i, p in swaps:
+                perm[[i, p]] = perm[[p, i]]
+                if k0:
+                    LU[[i, p], :k0] = LU[[p, i], :k0]
+                if k1 < n:
+                    LU[[i, p], k1:] = LU[[p, i], k1:]
+            if k1 < n:
+                # block row of U: U12 = L11^{-1} A12
+                U12 = np.array(LU[k0:k1, k1:])
+                for i in range(1, k1 - k0):
+                    U12[i] -= P[i, :i] @ U12[:i]
+                LU[k0:k1, k1:] = U12
+                # trailing update A22 -= L21 U12, one block of rows at a time
+                for r0 in range(k1, n, nb):
+                    r1 = min(n, r0 + nb)
+                    LU[r0:r1, k1:] -= P[r0 - k0:r1 - k0] @ U12
+            LU.flush()
+            report(k1 / n * 0.9, f"Panel kolom {k0 + 1}-{k1} selesai")
+
+        # Ly = Pb, then Ux = y, reading LU one block of rows at a time
+        y = rhs[perm].copy()
+        for i0 in range(0, n, nb):
+            i1 = min(n, i0 + nb)
+            rows = np.asarray(LU[i0:i1, :i1])
+            y[i0:i1] -= rows[:, :i0] @ y[:i0]
+            for i in range(1, i1 - i0):
+                y[i0 + i] -= rows[i, i0:i0 + i] @ y[i0:i0 + i]
+        report(0.95, "Substitusi maju selesai")
+        x = y
+        for i0 in reversed(range(0, n, nb)):
+            i1 = min(n, i0 + nb)
+            rows = np.asarray(LU[i0:i1, i0:])
+            x[i0:i1] -= rows[:, i1 - i0:] @ x[i1:]
+            for i in range(i1 - i0 - 1, -1, -1):
+                x[i0 + i] = (x[i0 + i] - rows[i, i + 1:i1 - i0] @ x[i0 + i + 1:i1]) / rows[i, i]
+
+        # residual, one more streaming pass over A
+        res = 0.0
+        for r0 in range(0, n, nb):
+            res += float(np.sum((np.asarray(src[r0:r0 + nb], dtype=float) @ x - rhs[r0:r0 + nb]) ** 2))
+        report(1.0, "Selesai")
+    finally:
+        del LU
+        if not keep_scratch:
+            try:
+                os.remove(scratch)
+            except OSError:
+                pass
+
+    steps = [
+        f"LU berblok di luar memori: n = {n}, blok {nb} kolom ({-(-n // nb)} panel), pivot parsial",
+        f"Memori kerja ~ {3 * n * nb * 8 / 2**20:.1f} MiB; faktor di berkas {scratch}"
+        + ("" if keep_scratch else " (dihapus)"),
+        f"Norma residu ||b - Ax||_2 = {res ** 0.5:.3e}",
+        "Solusi:",
+        _fmt_vector(x[:50]) + (f" ... ({n} komponen)" if n > 50 else ""),
     ]
     return x, steps
@@ -1,4 +1,12 @@
-from core.app import run
+import sys
+import time
 
 if __name__ == "__main__":
-    run()
+    if "--startup-time" in sys.argv:
+        # report import, history load and window construction times separately
+        t0 = time.perf_counter()
+        from core.app import measure_startup
+        measure_startup(time.perf_counter() - t0)
+    else:
+        from core.app import run
+        run()
@@ -0,0 +1,48 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from logic.spl_ops import blocked_lu_solve  # noqa: E402
+
+
+class BlockedLUTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_matches_numpy_when_n_is_not_a_block_multiple(self):
+        rng = np.random.default_rng(0)
+        for n, block in ((37, 8), (50, 16), (10, 64)):
+            A = rng.standard_normal((n, n))
+            b = rng.standard_normal(n)
+            path = os.path.join(self.dir, f"A_{n}.npy")
+            np.save(path, A)
+            x, _ = blocked_lu_solve(path, b, block=block)
+            np.testing.assert_allclose(x, np.linalg.solve(A, b), rtol=1e-9, atol=1e-12)
+
+    def test_needs_pivoting(self):
+        A = np.array([[0.0, 1, 2], [1, 0, 3], [4, -3, 8]])
+        b = np.array([1.0, 2, 3])
+        path = os.path.join(self.dir, "A.npy")
+        np.save(path, A)
+        x, _ = blocked_lu_solve(path, b, block=2)
+        np.testing.assert_allclose(x, np.linalg.solve(A, b), rtol=1e-12)
+
+    def test_scratch_removed(self):
+        path = os.path.join(self.dir, "A.npy")
+        np.save(path, np.eye(5) * 2)
+        blocked_lu_solve(path, np.ones(5), block=2)
+        self.assertEqual(sorted(os.listdir(self.dir)), ["A.npy"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,56 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from logic.spl_ops import gauss_jordan, gaussian_elimination  # noqa: E402
+
+SOLVERS = (gaussian_elimination, gauss_jordan)
+
+
+class ClassificationTest(unittest.TestCase):
+    def check_unique(self, A, b, expected):
+        for solve in SOLVERS:
+            x, _ = solve(A, b, steps="none")
+            np.testing.assert_allclose(x, expected, rtol=1e-12)
+
+    def test_unique(self):
+        A = np.array([[2.0, 1, 1], [4, -6, 0], [-2, 7, 2]])
+        self.check_unique(A, np.array([5.0, -2, 9]), [1, 1, 2])
+
+    def test_unique_scaled(self):
+        for s in (1e-13, 1e-150, 1e150):
+            self.check_unique(s * np.eye(2), np.array([s, 2 * s]), [1, 2])
+            self.check_unique(s * np.eye(2), np.array([1.0, 2]), [1 / s, 2 / s])
+
+    def test_inconsistent(self):
+        A = np.array([[1.0, 2], [2, 4]])
+        for s in (1.0, 1e-13, 1e20):
+            for solve in SOLVERS:
+                x, steps = solve(s * A, np.array([1.0, 3]) * s, steps="none")
+                self.assertIsNone(x)
+                self.assertIn("tidak konsisten", steps.lines()[-1])
+
+    def test_infinitely_many(self):
+        A = np.array([[1.0, 2, 3], [4, 5, 6], [7, 8, 9]])
+        for s in (1.0, 1e-13, 1e20):
+            for solve in SOLVERS:
+                x, steps = solve(s * A, s * np.array([1.0, 2, 3]), steps="none")
+                self.assertIsNotNone(x)
+                np.testing.assert_allclose(A @ x, [1, 2, 3], atol=1e-12)
+                self.assertTrue(any("tak hingga banyak solusi" in line for line in steps))
+
+    def test_zero_system(self):
+        for solve in SOLVERS:
+            x, _ = solve(np.zeros((2, 2)), np.zeros(2), steps="none")
+            np.testing.assert_array_equal(x, [0, 0])
+            x, _ = solve(np.zeros((2, 2)), np.ones(2), steps="none")
+            self.assertIsNone(x)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import os
+import sys
+import unittest
+from fractions import Fraction
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from logic.exact_ops import det_exact, rank_exact, solve_exact  # noqa: E402
+
+
+class BareissTest(unittest.TestCase):
+    def test_det_and_rank_match_numpy(self):
+        rng = np.random.default_rng(0)
+        for n in (1, 2, 3, 5, 8):
+            for _ in range(5):
+                A = rng.integers(-9, 10, size=(n, n))
+                det = det_exact(A)
+                self.assertEqual(det.denominator, 1)
+                self.assertAlmostEqual(float(det), np.linalg.det(A), delta=1e-6 * max(1.0, abs(float(det))))
+                self.assertEqual(rank_exact(A), np.linalg.matrix_rank(A))
+
+    def test_rank_deficient(self):
+        A = np.array([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+        self.assertEqual(det_exact(A), 0)
+        self.assertEqual(rank_exact(A), 2)
+        self.assertEqual(rank_exact(np.zeros((3, 4), dtype=int)), 0)
+        self.assertEqual(rank_exact(np.array([[1, 2, 3, 4], [2, 4, 6, 8]])), 1)
+
+    def test_fractions_are_exact(self):
+        A = np.array([[0.1, 0.2], [0.3, 0.4]])
+        self.assertEqual(det_exact(A), Fraction(-1, 50))
+
+    def test_solve(self):
+        x, _ = solve_exact(np.array([[2, 1, 1], [4, -6, 0], [-2, 7, 2]]), np.array([5, -2, 9]))
+        self.assertEqual(x, [1, 1, 2])
+        x, _ = solve_exact(np.array([[1, 2], [2, 4]]), np.array([1, 3]))
+        self.assertIsNone(x)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import json
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.history import HistoryManager  # noqa: E402
+from core.history_sqlite import SQLiteHistoryManager  # noqa: E402
+
+
+class ImportTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.h = HistoryManager(storage_path=os.path.join(self.dir, "history.json"))
+        for k in range(3):
+            self.h.add_matrix(np.eye(2) * k, f"M{k}")
+
+    def tearDown(self):
+        self.h.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_rejected_snapshot_keeps_history(self):
+        snapshot = os.path.join(self.dir, "snapshot.json")
+        self.h.save_to_file(snapshot)
+        before = [it.uid for it in self.h.list_matrix()]
+        for replace in (True, False):
+            with self.assertRaises(ValueError):
+                self.h.import_from_file(snapshot, replace=replace)
+            self.assertEqual([it.uid for it in self.h.list_matrix()], before)
+
+    def test_export_round_trip(self):
+        exported = os.path.join(self.dir, "export.json")
+        self.h.export_to_file(exported)
+        labels = [it.label for it in self.h.list_matrix()]
+        self.assertEqual(self.h.import_from_file(exported, replace=True), 3)
+        self.assertEqual([it.label for it in self.h.list_matrix()], labels)
+
+    def test_count_excludes_evicted(self):
+        source = HistoryManager(limit=100, storage_path=os.path.join(self.dir, "source.json"))
+        for k in range(52):
+            source.add_matrix(np.full((1, 1), float(k)), f"S{k}")
+        exported = os.path.join(self.dir, "export.json")
+        source.export_to_file(exported)
+        self.h.limit = self.h._matrix.limit = 50
+        self.assertEqual(self.h.import_from_file(exported, replace=True), 50)
+        self.assertEqual(len(self.h.list_matrix()), 50)
+
+
+class SQLiteImportTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.h = SQLiteHistoryManager(storage_path=os.path.join(self.dir, "history.sqlite3"))
+        self.h.add_matrix(np.ones((2, 2)), "mine")
+
+    def tearDown(self):
+        self.h.close()
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def test_rejected_snapshot_rolls_back(self):
+        source = HistoryManager(storage_path=os.path.join(self.dir, "history.json"))
+        source.add_matrix(np.eye(2), "A")
+        source.add_matrix(np.eye(3), "B")
+        snapshot = os.path.join(self.dir, "snapshot.json")
+        source.save_to_file(snapshot)
+        for replace in (True, False):
+            with self.assertRaises(ValueError):
+                self.h.import_from_file(snapshot, replace=replace)
+            self.assertEqual([(it.label, it.data.shape) for it in self.h.list_matrix()], [("mine", (2, 2))])
+
+    def test_reimport_without_ids_adds_nothing(self):
+        old = os.path.join(self.dir, "old.json")
+        with open(old, "w", encoding="utf-8") as f:
+            json.dump({"matrix": [{"label": "lama", "data": [[1, 2], [3, 4]]}]}, f)
+        self.assertEqual(self.h.import_from_file(old), 1)
+        self.assertEqual(self.h.import_from_file(old), 0)
+        self.assertEqual(len(self.h.list_matrix()), 2)
+
+    def test_count_excludes_dropped_rows(self):
+        self.h.limit = 3
+        old = os.path.join(self.dir, "old.json")
+        with open(old, "w", encoding="utf-8") as f:
+            json.dump({"matrix": [{"label": f"M{k}", "data": [[k]]} for k in range(5)]}, f)
+        self.assertEqual(self.h.import_from_file(old), 2)
+        self.assertEqual(len(self.h.list_matrix()), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
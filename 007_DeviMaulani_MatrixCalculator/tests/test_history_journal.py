@@ -0,0 +1,78 @@
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.history import HistoryManager  # noqa: E402
+
+
+class JournalReplayTest(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, "history.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.dir, ignore_errors=True)
+
+    def open(self) -> HistoryManager:
+        return HistoryManager(storage_path=self.path, journal=True)
+
+    def test_remove_from_snapshot_without_ids_survives_reopen(self):
+        # the bundled history.json predates item ids
+        shutil.copy(os.path.join(ROOT, "history.json"), self.path)
+        h = self.open()
+        before = [it.label for it in h.list_matrix()]
+        self.assertTrue(h.remove_matrix(0))
+        h.close()
+
+        h = self.open()
+        self.assertEqual([it.label for it in h.list_matrix()], before[1:])
+        self.assertEqual(len(h.list_matrix()), len(before) - 1)
+
+    def test_replay_matches_memory(self):
+        h = self.open()
+        for k in range(4):
+            h.add_matrix(np.full((2, 2), float(k)), f"M{k}")
+        h.add_vector(np.arange(3.0), "v")
+        h.remove_matrix(1)
+        expected = [it.uid for it in h.list_matrix()]
+        h.close()
+
+        h = self.open()
+        self.assertEqual([it.uid for it in h.list_matrix()], expected)
+        self.assertEqual(len(h.list_vector()), 1)
+
+    def test_replay_after_compaction(self):
+        h = HistoryManager(storage_path=self.path, journal=True, compact_every=3)
+        for k in range(5):
+            h.add_matrix(np.eye(2) * k, f"M{k}")
+        h.remove_matrix(0)
+        expected = [it.uid for it in h.list_matrix()]
+        h.close()
+
+        h = self.open()
+        self.assertEqual([it.uid for it in h.list_matrix()], expected)
+
+    def test_unsaved_add_survives_foreign_compaction(self):
+        a = HistoryManager(storage_path=self.path, journal=True, autosave_delay=60)
+        b = self.open()
+        a.add_matrix(np.eye(2), "mine")
+        b.add_matrix(np.eye(3), "theirs")
+        b.compact()
+        self.assertTrue(a.sync())
+        self.assertEqual([it.label for it in a.list_matrix()], ["mine", "theirs"])
+        a.close()
+        b.close()
+
+        h = self.open()
+        self.assertEqual(sorted(it.label for it in h.list_matrix()), ["mine", "theirs"])
+
+
+if __name__ == "__main__":
+    unittest.main()
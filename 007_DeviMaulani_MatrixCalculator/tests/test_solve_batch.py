@@ -0,0 +1,57 @@
+import os
+import sys
+import unittest
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from logic.spl_ops import solve_batch  # noqa: E402
+
+
+class SolveBatchTest(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.A = rng.standard_normal((5, 4, 4))
+        self.b = rng.standard_normal((5, 4))
+
+    def test_matches_numpy(self):
+        X, singular, residual = solve_batch(self.A, self.b)
+        self.assertFalse(singular.any())
+        np.testing.assert_allclose(X, np.linalg.solve(self.A, self.b[..., None])[..., 0], rtol=1e-10)
+        self.assertTrue(np.all(residual < 1e-12))
+
+    def test_singular_flags(self):
+        A = self.A.copy()
+        A[1, :, 3] = A[1, :, 0] + A[1, :, 2]
+        A[3] = 0.0
+        X, singular, residual = solve_batch(A, self.b)
+        np.testing.assert_array_equal(singular, [False, True, False, True, False])
+        self.assertTrue(np.isnan(X[singular]).all())
+        self.assertTrue(np.isinf(residual[singular]).all())
+        self.assertTrue(np.all(residual[~singular] < 1e-12))
+
+    def test_tolerance_is_per_system(self):
+        # a tiny but well-conditioned system next to ordinary ones
+        A = self.A.copy()
+        A[2] *= 1e-14
+        X, singular, residual = solve_batch(A, self.b)
+        self.assertFalse(singular.any())
+        np.testing.assert_allclose(X[2], np.linalg.solve(A[2], self.b[2]), rtol=1e-8)
+
+    def test_explicit_absolute_tolerance(self):
+        A = self.A.copy()
+        A[2] *= 1e-14
+        _, singular, _ = solve_batch(A, self.b, tol=1e-12)
+        self.assertTrue(singular[2])
+
+    def test_shape_errors(self):
+        with self.assertRaises(ValueError):
+            solve_batch(np.zeros((2, 3, 4)), np.zeros((2, 3)))
+        with self.assertRaises(ValueError):
+            solve_batch(self.A, self.b[:, :3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,4 +1,4 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QSpinBox, QTextEdit, QFrame
+from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QSpinBox, QTextEdit, QFrame, QCheckBox
 from PyQt5.QtCore import Qt
 import numpy as np
 
@@ -46,6 +46,11 @@ class MatrixCalculatorPage(QWidget):
         self.sp_count = QSpinBox(); self.sp_count.setRange(1, 5); self.sp_count.setValue(2)
         self.sp_count.valueChanged.connect(self._rebuild_inputs)
         ctrl.addWidget(self.sp_count)
+        self.chk_exact = QCheckBox("Eksak (pecahan)")
+        ctrl.addWidget(self.chk_exact)
+        ctrl.addWidget(QLabel("Faktorisasi:"))
+        self.cb_factor = QComboBox(); self.cb_factor.addItems(["QR (cepat)", "SVD (tepat)"])
+        ctrl.addWidget(self.cb_factor)
         ctrl.addStretch()
 
         self.btn_calc = QPushButton("Hitung")
@@ -92,7 +97,9 @@ class MatrixCalculatorPage(QWidget):
 
         self._rebuild_inputs()
         self._on_op_changed(self.cb_op.currentText())
-        self.refresh_history()
+        # history is loaded in the background; MainWindow refreshes the page once ready
+        if HISTORY.loaded:
+            self.refresh_history()
 
     def _on_op_changed(self, op: str):
         if op in ("Transpose", "Analisis"):
@@ -137,17 +144,21 @@ class MatrixCalculatorPage(QWidget):
                 text = "Hasil pengurangan:\n" + self._fmt_matrix(res)
 
             elif op == "Kali":
-                res = mats[0].copy()
-                for m in mats[1:]:
-                    res = mo.mul(res, m)
-                text = "Hasil perkalian berantai:\n" + self._fmt_matrix(res)
+                # the planner picks the cheapest parenthesization of the chain
+                res, plan = mo.mul_chain(mats)
+                text = (
+                    "Hasil perkalian berantai:\n" + self._fmt_matrix(res)
+                    + f"\n\nUrutan perkalian: {plan['urutan']}"
+                    + f"\nPerkiraan flop: {plan['flop_optimal']:,} (kiri ke kanan: {plan['flop_naif']:,})"
+                )
 
             elif op == "Transpose":
                 res = mo.transpose(mats[0])
                 text = "Transpose matriks A:\n" + self._fmt_matrix(res)
 
             elif op == "Analisis":
-                info = mo.analyze(mats[0])
+                method = "svd" if self.cb_factor.currentIndex() == 1 else "qr"
+                info = mo.analyze(mats[0], exact=self.chk_exact.isChecked(), method=method)
                 lines = ["Analisis matriks A:"]
                 for k, v in info.items():
                     if isinstance(v, float):
@@ -191,15 +202,17 @@ class MatrixCalculatorPage(QWidget):
         )
 
     def refresh_history(self):
+        # in-memory only; entries of other running instances arrive via MainWindow's background sync
         self.cb_hist.clear()
-        for item in HISTORY.list_matrix():
-            self.cb_hist.addItem(item.label)
+        # labels only: the entries themselves are fetched when one is used
+        self.cb_hist.addItems(HISTORY.labels("matrix"))
 
     def _use_history_to_index(self):
         idx = self.cb_hist.currentIndex()
-        items = HISTORY.list_matrix()
-        if 0 <= idx < len(items):
-            arr = items[idx].data
+        items = HISTORY.list_matrix(offset=idx, limit=1) if idx >= 0 else []
+        if items:
+            arr = items[0].data
+            HISTORY.touch_matrix(idx)
             target = self.sp_hist_i.value() - 1
             if target >= self.sp_count.value():
                 self.sp_count.setValue(target + 1)
@@ -210,9 +223,10 @@ class MatrixCalculatorPage(QWidget):
 
     def _add_history_as_new(self):
         idx = self.cb_hist.currentIndex()
-        items = HISTORY.list_matrix()
-        if 0 <= idx < len(items):
-            arr = items[idx].data
+        items = HISTORY.list_matrix(offset=idx, limit=1) if idx >= 0 else []
+        if items:
+            arr = items[0].data
+            HISTORY.touch_matrix(idx)
             current = self.sp_count.value()
             self.sp_count.setValue(current + 1)
             self._mat_widgets[-1].set_matrix(arr)
@@ -1,9 +1,13 @@
-from PyQt5.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QTextEdit, QFrame, QSpinBox
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox, QTextEdit, QFrame, QSpinBox,
+    QLineEdit, QCheckBox,
+)
 from PyQt5.QtCore import Qt
 import numpy as np
 
-from widgets.dynamic_inputs import MatrixInputWidget, VectorInputWidget
+from widgets.dynamic_inputs import MatrixInputWidget
 from logic import spl_ops as so
+from logic import exact_ops as eo
 from core.history import HISTORY
 
 
@@ -12,6 +16,14 @@ class SPLCalculatorPage(QWidget):
         super().__init__()
         self.navigate = navigate
         self._last_use_snapshot = None  # (A_prev, b_prev)
+        self._lu = None  # LU factorization of the last A, reused while A is unchanged
+        # iterative method -> (solver, takes a preconditioner)
+        self._iterative = {
+            "Gradien Konjugat (CG)": (so.conjugate_gradient, True),
+            "GMRES": (so.gmres, True),
+            "Iterasi Jacobi": (so.jacobi, False),
+            "Gauss–Seidel": (so.gauss_seidel, False),
+        }
         self._init_ui()
 
     def _init_ui(self):
@@ -42,14 +54,44 @@ class SPLCalculatorPage(QWidget):
             "Eliminasi Gauss–Jordan",
             "Aturan Cramer",
             "Invers Matriks",
+            "Dekomposisi LU",
+            "Otomatis (deteksi struktur)",
+            "Presisi campuran (float32)",
+            "Gradien Konjugat (CG)",
+            "GMRES",
+            "Iterasi Jacobi",
+            "Gauss–Seidel",
         ])
         row.addWidget(self.cb_method)
+        row.addWidget(QLabel("Langkah:"))
+        self.cb_steps = QComboBox()
+        # label -> step level understood by the elimination solvers
+        self._step_levels = {"Lengkap": "full", "Ringkas": "summary", "Tanpa langkah": "none"}
+        self.cb_steps.addItems(list(self._step_levels))
+        row.addWidget(self.cb_steps)
+        self.chk_lstsq = QCheckBox("Least squares jika tidak tunggal")
+        row.addWidget(self.chk_lstsq)
+        self.chk_exact = QCheckBox("Eksak (pecahan)")
+        row.addWidget(self.chk_exact)
         row.addStretch()
         self.btn_calc = QPushButton("Selesaikan")
         self.btn_calc.clicked.connect(self._solve)
         row.addWidget(self.btn_calc)
         root.addLayout(row)
 
+        # Controls for the iterative methods
+        it_row = QHBoxLayout()
+        it_row.addWidget(QLabel("Toleransi:"))
+        self.ed_tol = QLineEdit("1e-10"); self.ed_tol.setMaximumWidth(90)
+        it_row.addWidget(self.ed_tol)
+        it_row.addWidget(QLabel("Maks iterasi:"))
+        self.sp_maxiter = QSpinBox(); self.sp_maxiter.setRange(1, 1000000); self.sp_maxiter.setValue(1000)
+        it_row.addWidget(self.sp_maxiter)
+        self.chk_precond = QCheckBox("Prekondisi Jacobi (CG/GMRES)"); self.chk_precond.setChecked(True)
+        it_row.addWidget(self.chk_precond)
+        it_row.addStretch()
+        root.addLayout(it_row)
+
         # History controls
         hist = QHBoxLayout()
         hist.addWidget(QLabel("History:"))
@@ -73,7 +115,8 @@ class SPLCalculatorPage(QWidget):
         # Inputs A and b
         ins = QHBoxLayout()
         self.A_widget = MatrixInputWidget(title="Matriks A (koefisien)", rows=3, cols=3)
-        self.b_widget = VectorInputWidget(title="Vektor b (konstanta)", n=3)
+        # one column per right-hand side; only LU accepts more than one
+        self.b_widget = MatrixInputWidget(title="Vektor b (konstanta)", rows=3, cols=1)
         self.A_widget.row_spin.valueChanged.connect(self._sync_b_dim)
         ins.addWidget(self.A_widget)
         ins.addWidget(self.b_widget)
@@ -83,26 +126,53 @@ class SPLCalculatorPage(QWidget):
         self.result = QTextEdit(); self.result.setReadOnly(True)
         self.result.setStyleSheet("font-family: Consolas, monospace; font-size:14px;")
         root.addWidget(self.result)
-        self.refresh_history()
+        # history is loaded in the background; MainWindow refreshes the page once ready
+        if HISTORY.loaded:
+            self.refresh_history()
 
     def _sync_b_dim(self):
-        self.b_widget.dim_spin.setValue(self.A_widget.row_spin.value())
+        self.b_widget.row_spin.setValue(self.A_widget.row_spin.value())
 
     def _fmt_vector(self, v: np.ndarray) -> str:
         return "[ " + ", ".join(f"{float(x):.6g}" for x in v.ravel()) + " ]"
 
+    def _fmt_solution(self, X: np.ndarray) -> str:
+        if X.ndim < 2:
+            return self._fmt_vector(X)
+        return "\n".join(f"x{j+1} = {self._fmt_vector(X[:, j])}" for j in range(X.shape[1]))
+
+    def _b_input(self) -> np.ndarray:
+        B = self.b_widget.matrix()
+        return B[:, 0] if B.shape[1] == 1 else B
+
+    def _set_b(self, b: np.ndarray):
+        self.b_widget.set_matrix(b.reshape(b.shape[0], -1))
+
     def _solve(self):
         try:
             A = self.A_widget.matrix()
-            b = self.b_widget.vector()
+            b = self._b_input()
             method = self.cb_method.currentText()
+            level = self._step_levels[self.cb_steps.currentText()]
+            if b.ndim > 1 and method != "Dekomposisi LU":
+                raise ValueError("Beberapa kolom b hanya didukung oleh metode Dekomposisi LU")
 
-            if method == "Eliminasi Gauss":
-                x, steps = so.gaussian_elimination(A, b)
-                text = ["Solusi dengan Eliminasi Gauss:", self._fmt_vector(x), "", "Langkah-langkah:"] + steps
-            elif method == "Eliminasi Gauss–Jordan":
-                x, steps = so.gauss_jordan(A, b)
-                text = ["Solusi dengan Gauss–Jordan:", self._fmt_vector(x), "", "Langkah-langkah:"] + steps
+            if self.chk_exact.isChecked():
+                if b.ndim > 1:
+                    raise ValueError("Mode eksak hanya menerima satu kolom b")
+                xq, steps = eo.solve_exact(A, b)
+                method = "Eksak (Bareiss)"
+                x = None if xq is None else np.array([float(v) for v in xq])
+                head = "Tidak ada solusi (SPL tidak konsisten)." if xq is None else "x = [ " + ", ".join(eo.fmt_fraction(v) for v in xq) + " ]"
+                text = ["Solusi eksak:", head, "", "Langkah-langkah:"] + steps
+            elif method in ("Eliminasi Gauss", "Eliminasi Gauss–Jordan"):
+                solver = so.gaussian_elimination if method == "Eliminasi Gauss" else so.gauss_jordan
+                x, steps = solver(A, b, steps=level, lstsq=self.chk_lstsq.isChecked())
+                title = "Solusi dengan Eliminasi Gauss:" if method == "Eliminasi Gauss" else "Solusi dengan Gauss–Jordan:"
+                if x is None:
+                    text = [title, "Tidak ada solusi (SPL tidak konsisten).", "", "Langkah-langkah:"] + steps
+                else:
+                    text = [title, self._fmt_vector(x), "", "Langkah-langkah:"] + steps
             elif method == "Aturan Cramer":
                 x, steps = so.cramer(A, b)
                 if x is None:
@@ -110,8 +180,29 @@ class SPLCalculatorPage(QWidget):
                 else:
                     text = ["Aturan Cramer:", self._fmt_vector(x), "", "Langkah-langkah:"] + steps
             elif method == "Invers Matriks":
-                x, steps = so.inverse_method(A, b)
+                x, steps = so.inverse_method(A, b, steps=level)
                 text = ["Metode Invers Matriks:", self._fmt_vector(x), "", "Langkah-langkah:"] + steps
+            elif method == "Otomatis (deteksi struktur)":
+                x, steps = so.solve_structured(A, b, steps=level)
+                text = ["Solusi otomatis:", self._fmt_vector(x), "", "Langkah-langkah:"] + steps
+            elif method == "Presisi campuran (float32)":
+                x, steps = so.mixed_precision_solve(A, b, steps=level)
+                text = ["Solusi presisi campuran:", self._fmt_vector(x), "", "Langkah-langkah:"] + steps
+            elif method in self._iterative:
+                solver, precond = self._iterative[method]
+                try:
+                    tol = float(self.ed_tol.text())
+                except ValueError:
+                    raise ValueError("Toleransi harus berupa angka, misalnya 1e-10")
+                opts = {"tol": tol, "maxiter": self.sp_maxiter.value(), "steps": level}
+                if precond:
+                    opts["precondition"] = self.chk_precond.isChecked()
+                x, steps = solver(A, b, **opts)
+                head = "Tidak ada solusi (iterasi divergen)." if x is None else self._fmt_vector(x)
+                text = [f"{method}:", head, "", "Langkah-langkah:"] + steps
+            elif method == "Dekomposisi LU":
+                x, steps, self._lu = so.lu_decomposition(A, b, steps=level, factor=self._lu)
+                text = ["Solusi dengan Dekomposisi LU:", self._fmt_solution(x), "", "Langkah-langkah:"] + steps
             else:
                 text = ["Metode tidak dikenal"]
 
@@ -119,7 +210,10 @@ class SPLCalculatorPage(QWidget):
             try:
                 HISTORY.add_spl(A, b, method, steps, label=f"{method} ({A.shape[0]}x{A.shape[1]})")
                 if 'x' in locals() and x is not None:
-                    HISTORY.add_vector(np.array(x), label=f"Solusi x - {method}")
+                    if np.ndim(x) > 1:
+                        HISTORY.add_matrix(np.array(x), label=f"Solusi X - {method}")
+                    else:
+                        HISTORY.add_vector(np.array(x), label=f"Solusi x - {method}")
                 self.refresh_history()
             except Exception:
                 pass
@@ -127,28 +221,33 @@ class SPLCalculatorPage(QWidget):
             self.result.setText(f"Error: {e}")
 
     def refresh_history(self):
+        # in-memory only; entries of other running instances arrive via MainWindow's background sync
         self.cb_hist.clear()
-        for item in HISTORY.list_spl():
-            self.cb_hist.addItem(item.label)
+        # labels only: the entries themselves are fetched when one is used
+        self.cb_hist.addItems(HISTORY.labels("spl"))
 
     def _use_history(self):
         idx = self.cb_hist.currentIndex()
-        items = HISTORY.list_spl()
-        if 0 <= idx < len(items):
-            it = items[idx]
+        items = HISTORY.list_spl(offset=idx, limit=1) if idx >= 0 else []
+        if items:
+            it = items[0]
+            HISTORY.touch_spl(idx)
             # snapshot
             A_prev = self.A_widget.matrix()
-            b_prev = self.b_widget.vector()
+            b_prev = self._b_input()
             self._last_use_snapshot = (A_prev, b_prev)
             self.A_widget.set_matrix(it.A)
-            self.b_widget.set_vector(it.b)
+            self._set_b(it.b)
+            # stored step logs are only rendered to text here, when the entry is opened
+            if it.steps:
+                self.result.setText("\n".join([f"{it.method}:", "", "Langkah-langkah:"] + list(it.steps)))
 
     def _undo_history_use(self):
         if self._last_use_snapshot is None:
             return
         A_prev, b_prev = self._last_use_snapshot
         self.A_widget.set_matrix(A_prev)
-        self.b_widget.set_vector(b_prev)
+        self._set_b(b_prev)
         self._last_use_snapshot = None
 
     def _delete_history(self):
@@ -160,7 +259,8 @@ class SPLCalculatorPage(QWidget):
         self.cb_method.setCurrentIndex(0)
         self.A_widget.row_spin.setValue(3)
         self.A_widget.col_spin.setValue(3)
-        self.b_widget.dim_spin.setValue(3)
+        self.b_widget.row_spin.setValue(3)
+        self.b_widget.col_spin.setValue(1)
         self.result.clear()
         try:
             self.A_widget.reset_values()
@@ -129,7 +129,9 @@ class VectorCalculatorPage(QWidget):
 
         self._rebuild_inputs()
         self._on_op_changed(self.cb_op.currentText())
-        self.refresh_history()
+        # history is loaded in the background; MainWindow refreshes the page once ready
+        if HISTORY.loaded:
+            self.refresh_history()
 
     def _fmt_vector(self, v: np.ndarray) -> str:
         return "[ " + ", ".join(f"{float(x):.6g}" for x in v.ravel()) + " ]"
@@ -281,15 +283,17 @@ class VectorCalculatorPage(QWidget):
         self._on_op_changed(self.cb_op.currentText())
 
     def refresh_history(self):
+        # in-memory only; entries of other running instances arrive via MainWindow's background sync
         self.cb_hist.clear()
-        for item in HISTORY.list_vector():
-            self.cb_hist.addItem(item.label)
+        # labels only: the entries themselves are fetched when one is used
+        self.cb_hist.addItems(HISTORY.labels("vector"))
 
     def _use_history_to_index(self):
         idx = self.cb_hist.currentIndex()
-        items = HISTORY.list_vector()
-        if 0 <= idx < len(items):
-            v = items[idx].data
+        items = HISTORY.list_vector(offset=idx, limit=1) if idx >= 0 else []
+        if items:
+            v = items[0].data
+            HISTORY.touch_vector(idx)
             target = self.sp_hist_i.value() - 1
             if target >= self.sp_count.value():
                 self.sp_count.setValue(target + 1)
@@ -299,9 +303,10 @@ class VectorCalculatorPage(QWidget):
 
     def _add_history_as_new(self):
         idx = self.cb_hist.currentIndex()
-        items = HISTORY.list_vector()
-        if 0 <= idx < len(items):
-            v = items[idx].data
+        items = HISTORY.list_vector(offset=idx, limit=1) if idx >= 0 else []
+        if items:
+            v = items[0].data
+            HISTORY.touch_vector(idx)
             current = self.sp_count.value()
             self.sp_count.setValue(current + 1)
             self._vec_widgets[-1].set_vector(v)
@@ -47,10 +47,13 @@ class WelcomePage(QWidget):
         row2 = QHBoxLayout()
         btn_quiz = QPushButton("Kuis Interaktif")
         btn_export = QPushButton("Export History")
+        btn_import = QPushButton("Import History")
         btn_quiz.clicked.connect(lambda: self.navigate("quiz_setup"))
         btn_export.clicked.connect(self._export_history)
+        btn_import.clicked.connect(self._import_history)
         row2.addWidget(btn_quiz)
         row2.addWidget(btn_export)
+        row2.addWidget(btn_import)
         layout.addLayout(row2)
 
         foot = QLabel("Selamat datang! Pilih jenis kalkulator untuk memulai.")
@@ -59,11 +62,28 @@ class WelcomePage(QWidget):
         layout.addWidget(foot)
 
     def _export_history(self):
-        path, _ = QFileDialog.getSaveFileName(self, "Simpan History ke JSON", "history.json", "JSON Files (*.json)")
+        formats = {
+            "JSON Files (*.json)": "json",
+            "JSON ringkas (*.json *.json.gz)": "compact",
+            "NDJSON (*.ndjson *.ndjson.gz)": "ndjson",
+        }
+        path, selected = QFileDialog.getSaveFileName(self, "Simpan History ke JSON", "history.json", ";;".join(formats))
         if not path:
             return
         try:
-            HISTORY.export_to_file(path)
+            HISTORY.export_to_file(path, formats.get(selected))
             QMessageBox.information(self, "Sukses", f"History berhasil diexport ke:\n{path}")
         except Exception as e:
             QMessageBox.critical(self, "Gagal", f"Gagal menyimpan history: {e}")
+
+    def _import_history(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Buka History", "", "History (*.json *.json.gz *.ndjson *.ndjson.gz *.jsonl)"
+        )
+        if not path:
+            return
+        try:
+            count = HISTORY.import_from_file(path)
+            QMessageBox.information(self, "Sukses", f"{count} entri history berhasil diimport dari:\n{path}")
+        except Exception as e:
+            QMessageBox.critical(self, "Gagal", f"Gagal membaca history: {e}")